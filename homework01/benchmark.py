@@ -0,0 +1,188 @@
+import os
+import random
+import string
+import time
+
+import rsa
+
+from caesar import encrypt_caesar, encrypt_caesar_bytes
+from parallel import translate_parallel
+from vigenere import encrypt_vigenere, encrypt_vigenere_bytes, make_tables
+
+
+def legacy_encrypt_caesar(plaintext: str) -> str:
+    """ The original character-by-character Caesar cipher, kept for comparison """
+    ciphertext = ''
+    for i in range(len(plaintext)):
+        if plaintext[i].isalpha():
+            if chr((ord(plaintext[i]) + 3)).isalpha():
+                ciphertext += chr(ord(plaintext[i]) + 3)
+            else:
+                ciphertext += chr(ord(plaintext[i]) - 23)
+        else:
+            ciphertext += plaintext[i]
+    return ciphertext
+
+
+def legacy_encrypt_vigenere(plaintext: str, keyword: str) -> str:
+    """ The original character-by-character Vigenere cipher, kept for comparison """
+    ciphertext = ""
+    keyword1 = [ord(c) - 65 if c.isupper() else ord(c) - 97 for c in keyword]
+    keyword1 *= len(plaintext) // len(keyword1) + 1
+    for i in range(len(plaintext)):
+        if plaintext[i].islower():
+            if (ord(plaintext[i]) + keyword1[i]) > 122:
+                ciphertext += chr(ord(plaintext[i]) + keyword1[i] - 26)
+            else:
+                ciphertext += chr(ord(plaintext[i]) + keyword1[i])
+        elif plaintext[i].isupper():
+            if (ord(plaintext[i]) + keyword1[i]) > 90:
+                ciphertext += chr(ord(plaintext[i]) + keyword1[i] - 26)
+            else:
+                ciphertext += chr(ord(plaintext[i]) + keyword1[i])
+        else:
+            ciphertext += plaintext[i]
+    return ciphertext
+
+
+def legacy_is_prime(n: int) -> bool:
+    for i in range(2, n):
+        if n % i == 0:
+            return False
+    return n > 1
+
+
+def legacy_gcd(a: int, b: int) -> int:
+    while a != b:
+        if a > b:
+            a = a - b
+        else:
+            b = b - a
+    return a
+
+
+def legacy_multiplicative_inverse(e: int, phi: int) -> int:
+    n = 1
+    while ((n * phi) + 1) % e != 0:
+        n += 1
+    return ((n * phi) + 1) // e
+
+
+def legacy_encrypt(pk, plaintext):
+    key, n = pk
+    return [(ord(char) ** key) % n for char in plaintext]
+
+
+def random_text(size: int) -> str:
+    alphabet = string.ascii_letters + ' .,\n'
+    return ''.join(random.choices(alphabet, k=size))
+
+
+def throughput(func, *args, size: int, repeat: int = 3) -> float:
+    """ Best throughput of `repeat` runs in MB/s """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return size / best / 2 ** 20
+
+
+def per_operation(func, *args, number: int = 10) -> float:
+    """ Average time of one call in microseconds """
+    start = time.perf_counter()
+    for _ in range(number):
+        func(*args)
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def bench_rsa() -> None:
+    # Small numbers, so that the original functions finish at all
+    p, q, e = 1009, 1013, 65537
+    phi = (p - 1) * (q - 1)
+    message = 'Hello, World!'
+    rows = [
+        ('is_prime(999983)', (legacy_is_prime, 999983), (rsa.is_prime, 999983)),
+        ('gcd(10**6, 7)', (legacy_gcd, 10 ** 6, 7), (rsa.gcd, 10 ** 6, 7)),
+        ('inverse(65537, phi)', (legacy_multiplicative_inverse, e, phi),
+         (rsa.multiplicative_inverse, e, phi)),
+        ('encrypt 13 chars', (legacy_encrypt, (e, p * q), message),
+         (rsa.encrypt, (e, p * q), message)),
+    ]
+    print(f'{"operation":<24}{"legacy, us":>14}{"new, us":>12}')
+    for name, legacy, new in rows:
+        print(f'{name:<24}{per_operation(*legacy):14.1f}{per_operation(*new):12.1f}')
+
+    # Real key sizes with Mersenne primes 2**521 - 1 and 2**607 - 1
+    p, q = 2 ** 521 - 1, 2 ** 607 - 1
+    public, private = rsa.generate_keypair(p, q)
+    encrypted = rsa.encrypt(public, message)
+    print('1128-bit modulus, new implementation only:')
+    print(f'{"is_prime(2**607 - 1)":<24}{per_operation(rsa.is_prime, q):26.1f}')
+    print(f'{"generate_keypair":<24}{per_operation(rsa.generate_keypair, p, q):26.1f}')
+    print(f'{"encrypt 13 chars":<24}{per_operation(rsa.encrypt, public, message):26.1f}')
+    print(f'{"decrypt 13 chars":<24}{per_operation(rsa.decrypt, private, encrypted):26.1f}')
+
+
+def bench_keygen(keys: int = 3) -> None:
+    workers = os.cpu_count() or 1
+    print(f'Key generation, keys/second (1 process / {workers} processes)')
+    for bits in (1024, 2048, 3072):
+        rates = []
+        for pool_size in (None, workers):
+            start = time.perf_counter()
+            for _ in range(keys):
+                rsa.generate_large_keypair(bits, pool_size)
+            rates.append(keys / (time.perf_counter() - start))
+        print(f'{bits:>5} bits {rates[0]:10.2f} {rates[1]:10.2f}')
+
+
+def bench_blocks(bits: int = 2048) -> None:
+    public, private = rsa.generate_block_keypair(bits)
+    message = random_text(2 ** 14).encode()
+    ciphertext = rsa.encrypt_blocks(public, message)
+    plain_key = (private.d, private.n)
+    rows = [
+        ('encrypt_blocks', rsa.encrypt_blocks, public, message),
+        ('decrypt_blocks (d, n)', rsa.decrypt_blocks, plain_key, ciphertext),
+        ('decrypt_blocks CRT', rsa.decrypt_blocks, private, ciphertext),
+    ]
+    print(f'Block RSA, {bits}-bit modulus, {len(message)} bytes, ms per message')
+    for name, func, key, data in rows:
+        print(f'{name:<24}{per_operation(func, key, data, number=3) / 1000:10.1f}')
+
+
+def bench_ciphers(size: int = 2 ** 20) -> None:
+    text = random_text(size)
+    data = text.encode()
+    keyword = 'LEMON'
+    rows = [
+        ('caesar (legacy)', legacy_encrypt_caesar, (text,)),
+        ('caesar str', encrypt_caesar, (text,)),
+        ('caesar bytes', encrypt_caesar_bytes, (data,)),
+        ('vigenere (legacy)', legacy_encrypt_vigenere, (text, keyword)),
+        ('vigenere str', encrypt_vigenere, (text, keyword)),
+        ('vigenere bytes', encrypt_vigenere_bytes, (data, keyword)),
+    ]
+    print(f'Encrypting {size / 2 ** 20:.1f} MB')
+    for name, func, args in rows:
+        print(f'{name:<20} {throughput(func, *args, size=size):10.1f} MB/s')
+
+
+def bench_parallel(size: int = 2 ** 26) -> None:
+    data = random_text(2 ** 20).encode() * (size // 2 ** 20)
+    tables = make_tables('LEMON')
+    print(f'Parallel Vigenere on {len(data) / 2 ** 20:.0f} MB')
+    base = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        mbs = throughput(translate_parallel, data, tables, workers, size=len(data))
+        base = base or mbs
+        print(f'{workers:>2} workers {mbs:10.1f} MB/s  x{mbs / base:.2f}')
+
+
+if __name__ == '__main__':
+    bench_ciphers()
+    bench_parallel()
+    bench_rsa()
+    bench_keygen()
+    bench_blocks()
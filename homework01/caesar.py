@@ -1,5 +1,26 @@
+import functools
+import string
 
-def encrypt_caesar(plaintext: str) -> str:
+
+@functools.lru_cache(maxsize=64)
+def make_table(shift: int) -> bytes:
+    """
+        Builds a translation table that shifts ASCII letters by `shift`.
+        The same 256-byte table works with both str.translate and
+        bytes.translate; every other character is left untouched.
+        >>> 'xyz ABC'.translate(make_table(3))
+        'abc DEF'
+        >>> b'abc'.translate(make_table(-1))
+        b'zab'
+        """
+    shift %= 26
+    upper = string.ascii_uppercase
+    lower = string.ascii_lowercase
+    shifted = upper[shift:] + upper[:shift] + lower[shift:] + lower[:shift]
+    return bytes.maketrans((upper + lower).encode(), shifted.encode())
+
+
+def encrypt_caesar(plaintext: str, shift: int = 3) -> str:
     """
         Encrypts plaintext using a Caesar cipher.
         >>> encrypt_caesar("PYTHON")
@@ -11,19 +32,10 @@ def encrypt_caesar(plaintext: str) -> str:
         >>> encrypt_caesar("")
         ''
         """
-    ciphertext = ''
-    for i in range(len(plaintext)):
-        if plaintext[i].isalpha():
-            if chr((ord(plaintext[i]) + 3)).isalpha():
-                ciphertext += chr(ord(plaintext[i]) + 3)
-            else:
-                ciphertext += chr(ord(plaintext[i]) - 23)
-        else:
-            ciphertext += plaintext[i]
-    return ciphertext
-
-
-def decrypt_caesar(ciphertext: str) -> str:
+    return plaintext.translate(make_table(shift))
+
+
+def decrypt_caesar(ciphertext: str, shift: int = 3) -> str:
     """
         Decrypts a ciphertext using a Caesar cipher.
         >>> decrypt_caesar("SBWKRQ")
@@ -35,13 +47,22 @@ def decrypt_caesar(ciphertext: str) -> str:
         >>> decrypt_caesar("")
         ''
         """
-    plaintext = ''
-    for i in range(len(ciphertext)):
-        if ciphertext[i].isalpha():
-            if chr((ord(ciphertext[i]) - 3)).isalpha():
-                plaintext += chr(ord(ciphertext[i]) - 3)
-            else:
-                plaintext += chr(ord(ciphertext[i]) + 23)
-        else:
-            plaintext += ciphertext[i]
-    return plaintext
+    return ciphertext.translate(make_table(-shift))
+
+
+def encrypt_caesar_bytes(plaintext: bytes, shift: int = 3) -> bytes:
+    """
+        Encrypts ASCII letters of a bytes object using a Caesar cipher.
+        >>> encrypt_caesar_bytes(b"Python3.6")
+        b'Sbwkrq3.6'
+        """
+    return plaintext.translate(make_table(shift))
+
+
+def decrypt_caesar_bytes(ciphertext: bytes, shift: int = 3) -> bytes:
+    """
+        Decrypts ASCII letters of a bytes object using a Caesar cipher.
+        >>> decrypt_caesar_bytes(b"Sbwkrq3.6")
+        b'Python3.6'
+        """
+    return ciphertext.translate(make_table(-shift))
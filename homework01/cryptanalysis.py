@@ -0,0 +1,171 @@
+import numpy as np
+
+ENGLISH_FREQUENCIES = np.array([
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+    0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+    0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+    0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+])
+
+# SHIFTED[s, i] is the ciphertext letter that shift s turns letter i into
+SHIFTED = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+SAMPLE_SIZE = 1 << 18
+# Below this many repeat distances Kasiski counts are too noisy to use
+KASISKI_MIN_REPEATS = 30
+
+
+def letter_codes(text) -> tuple:
+    """
+    Returns letter codes 0..25 of the ASCII letters in `text` and their
+    positions in the text (the Vigenere key advances on every character).
+    >>> codes, positions = letter_codes("Hi, Bob")
+    >>> codes.tolist(), positions.tolist()
+    ([7, 8, 1, 14, 1], [0, 1, 4, 5, 6])
+    """
+    if isinstance(text, str):
+        chars = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    else:
+        chars = np.frombuffer(text, dtype=np.uint8)
+    upper = chars - 65
+    lower = chars - 97
+    is_upper = upper < 26
+    is_letter = is_upper | (lower < 26)
+    codes = np.where(is_upper, upper, lower)[is_letter].astype(np.int64)
+    return codes, np.flatnonzero(is_letter)
+
+
+def column_counts(codes: np.ndarray, positions: np.ndarray, length: int) -> np.ndarray:
+    """
+    Letter counts for every key column, shape (length, 26).
+    >>> column_counts(*letter_codes("abab"), 2)[:, :2].tolist()
+    [[2, 0], [0, 2]]
+    """
+    columns = positions % length
+    counts = np.bincount(columns * 26 + codes, minlength=length * 26)
+    return counts.reshape(length, 26)
+
+
+def index_of_coincidence(counts: np.ndarray) -> np.ndarray:
+    """
+    Index of coincidence along the last axis of `counts`.
+    >>> float(index_of_coincidence(np.array([2, 2])))
+    0.3333333333333333
+    """
+    total = counts.sum(axis=-1)
+    pairs = (counts * (counts - 1)).sum(axis=-1)
+    return pairs / np.maximum(total * (total - 1), 1)
+
+
+def key_length_scores(ciphertext, max_length: int = 40) -> np.ndarray:
+    """
+    Average column index of coincidence for every key length; element 0 is
+    unused. English text scores about 0.066, random text about 0.038.
+    """
+    codes, positions = letter_codes(ciphertext)
+    codes, positions = codes[:SAMPLE_SIZE], positions[:SAMPLE_SIZE]
+    scores = np.zeros(max_length + 1)
+    for length in range(1, max_length + 1):
+        scores[length] = index_of_coincidence(column_counts(codes, positions, length)).mean()
+    return scores
+
+
+def kasiski_scores(ciphertext, max_length: int = 40) -> np.ndarray:
+    """
+    Number of distances between repeated trigrams divisible by every key
+    length; element 0 is unused.
+    """
+    codes, positions = letter_codes(ciphertext)
+    codes, positions = codes[:SAMPLE_SIZE], positions[:SAMPLE_SIZE]
+    scores = np.zeros(max_length + 1, dtype=np.int64)
+    if len(codes) < 3:
+        return scores
+    trigrams = codes[:-2] * 676 + codes[1:-1] * 26 + codes[2:]
+    order = np.argsort(trigrams, kind='stable')
+    repeated = trigrams[order[1:]] == trigrams[order[:-1]]
+    distances = positions[order[1:]][repeated] - positions[order[:-1]][repeated]
+    lengths = np.arange(1, max_length + 1)
+    scores[1:] = (distances[:, None] % lengths[None, :] == 0).sum(axis=0)
+    return scores
+
+
+def guess_key_length(ciphertext, max_length: int = 40) -> int:
+    """
+    Candidates are the key lengths whose index of coincidence is close to the
+    best one. The shortest candidate may be a divisor of the key length, so
+    when there are enough repeated trigrams the guess moves on to a candidate
+    multiple that explains nearly as many Kasiski distances: a real key length
+    keeps them, a multiple of it loses about half. Text too short to score
+    gives length 1.
+    >>> guess_key_length("abc")
+    1
+    """
+    scores = key_length_scores(ciphertext, max_length)[1:]
+    if not scores.max() > 0:
+        return 1
+    candidates = np.flatnonzero(scores >= 0.8 * scores.max()) + 1
+    counts = kasiski_scores(ciphertext, max_length)
+    length = int(candidates[0])
+    if counts[length] < KASISKI_MIN_REPEATS:
+        return length
+    for candidate in candidates[1:]:
+        if candidate % length == 0 and counts[candidate] >= 0.9 * counts[length]:
+            length = int(candidate)
+    return length
+
+
+def chi_squared(counts: np.ndarray) -> np.ndarray:
+    """
+    Chi-squared distance from English for every shift, computed for all
+    rows of `counts` (shape (..., 26)) at once. Result shape is (..., 26).
+    """
+    observed = counts[..., SHIFTED]
+    expected = counts.sum(axis=-1)[..., None, None] * ENGLISH_FREQUENCIES
+    expected = np.maximum(expected, 1e-9)
+    return ((observed - expected) ** 2 / expected).sum(axis=-1)
+
+
+def recover_key(ciphertext, length: int) -> str:
+    """ Recovers a Vigenere key of known length column by column """
+    counts = column_counts(*letter_codes(ciphertext), length)
+    shifts = chi_squared(counts).argmin(axis=-1)
+    return ''.join(chr(65 + shift) for shift in shifts)
+
+
+def break_vigenere(ciphertext, max_length: int = 40) -> str:
+    """
+    Finds the key of a Vigenere ciphertext.
+    >>> from vigenere import encrypt_vigenere
+    >>> text = ("It was the best of times, it was the worst of times, it was the "
+    ...         "age of wisdom, it was the age of foolishness, it was the epoch "
+    ...         "of belief, it was the epoch of incredulity, it was the season of "
+    ...         "Light, it was the season of Darkness, it was the spring of hope, "
+    ...         "it was the winter of despair, we had everything before us, we had "
+    ...         "nothing before us, we were all going direct to Heaven, we were all "
+    ...         "going direct the other way - in short, the period was so far like "
+    ...         "the present period, that some of its noisiest authorities insisted "
+    ...         "on its being received, for good or for evil, in the superlative "
+    ...         "degree of comparison only.")
+    >>> break_vigenere(encrypt_vigenere(text, "LEMON"))
+    'LEMON'
+    >>> break_vigenere(encrypt_vigenere(text, "Dickens"))
+    'DICKENS'
+    """
+    return recover_key(ciphertext, guess_key_length(ciphertext, max_length))
+
+
+def rank_caesar_shifts(ciphertext) -> list:
+    """
+    Scores all 26 Caesar shifts in one batched pass; best shift first.
+    >>> from caesar import encrypt_caesar
+    >>> rank_caesar_shifts(encrypt_caesar("Meet me at the usual place at ten"))[0][0]
+    3
+    """
+    counts = np.bincount(letter_codes(ciphertext)[0], minlength=26)
+    scores = chi_squared(counts)
+    return [(int(shift), float(scores[shift])) for shift in np.argsort(scores)]
+
+
+def break_caesar(ciphertext) -> int:
+    """ Returns the most likely Caesar shift """
+    return rank_caesar_shifts(ciphertext)[0][0]
@@ -0,0 +1,114 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from stream import make_cipher_tables
+from vigenere import apply_tables
+
+CHUNK_SIZE = 1 << 22
+
+
+def split_chunks(size: int, period: int, chunk_size: int = CHUNK_SIZE) -> list:
+    """
+    Splits range(size) into (start, stop) pairs whose starts are multiples
+    of the key period, so each chunk begins at key position 0.
+    >>> split_chunks(12, 5, 7)
+    [(0, 5), (5, 10), (10, 12)]
+    """
+    step = max(period, chunk_size // period * period)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _translate_shared(src_name: str, dst_name: str, start: int, stop: int, tables: list) -> None:
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    try:
+        dst.buf[start:stop] = apply_tables(bytes(src.buf[start:stop]), tables, start)
+    finally:
+        src.close()
+        dst.close()
+
+
+def _translate_mapped(src_path: str, dst_path: str, start: int, stop: int, tables: list) -> None:
+    with open(src_path, 'rb') as src_file, open(dst_path, 'r+b') as dst_file:
+        with mmap.mmap(src_file.fileno(), 0, access=mmap.ACCESS_READ) as src, \
+                mmap.mmap(dst_file.fileno(), 0) as dst:
+            dst[start:stop] = apply_tables(src[start:stop], tables, start)
+
+
+def translate_parallel(data: bytes, tables: list, workers: int = None,
+                       chunk_size: int = CHUNK_SIZE) -> bytes:
+    """
+    Translates `data` across a process pool. Input and output live in shared
+    memory, so workers receive only offsets instead of pickled chunks.
+    >>> from vigenere import make_tables
+    >>> translate_parallel(b"ATTACKATDAWN", make_tables("LEMON"), 2, 5)
+    b'LXFOPVEFRNHR'
+    """
+    if not data:
+        return b''
+    src = shared_memory.SharedMemory(create=True, size=len(data))
+    dst = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        src.buf[:len(data)] = data
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_translate_shared, src.name, dst.name, start, stop, tables)
+                       for start, stop in split_chunks(len(data), len(tables), chunk_size)]
+            for future in futures:
+                future.result()
+        return bytes(dst.buf[:len(data)])
+    finally:
+        for shm in (src, dst):
+            shm.close()
+            shm.unlink()
+
+
+def translate_file_parallel(src_path: str, dst_path: str, tables: list, workers: int = None,
+                            chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Translates a file into `dst_path` across a process pool. Every worker
+    memory-maps both files and handles its own byte range.
+    """
+    size = os.path.getsize(src_path)
+    with open(dst_path, 'wb') as dst_file:
+        dst_file.truncate(size)
+    if not size:
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_translate_mapped, src_path, dst_path, start, stop, tables)
+                   for start, stop in split_chunks(size, len(tables), chunk_size)]
+        for future in futures:
+            future.result()
+
+
+def encrypt_vigenere_parallel(plaintext: bytes, keyword: str, workers: int = None) -> bytes:
+    """
+    >>> encrypt_vigenere_parallel(b"ATTACKATDAWN", "LEMON", 2)
+    b'LXFOPVEFRNHR'
+    """
+    return translate_parallel(plaintext, make_cipher_tables('vigenere', keyword), workers)
+
+
+def decrypt_vigenere_parallel(ciphertext: bytes, keyword: str, workers: int = None) -> bytes:
+    """
+    >>> decrypt_vigenere_parallel(b"LXFOPVEFRNHR", "LEMON", 2)
+    b'ATTACKATDAWN'
+    """
+    return translate_parallel(ciphertext, make_cipher_tables('vigenere', keyword, True), workers)
+
+
+def encrypt_caesar_parallel(plaintext: bytes, shift: int = 3, workers: int = None) -> bytes:
+    """
+    >>> encrypt_caesar_parallel(b"Python3.6", workers=2)
+    b'Sbwkrq3.6'
+    """
+    return translate_parallel(plaintext, make_cipher_tables('caesar', shift), workers)
+
+
+def decrypt_caesar_parallel(ciphertext: bytes, shift: int = 3, workers: int = None) -> bytes:
+    """
+    >>> decrypt_caesar_parallel(b"Sbwkrq3.6", workers=2)
+    b'Python3.6'
+    """
+    return translate_parallel(ciphertext, make_cipher_tables('caesar', shift, True), workers)
@@ -1,16 +1,76 @@
-def is_prime(n: int) -> bool:
+import math
+import random
+import secrets
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+# Miller-Rabin with these bases is exact for every n below DETERMINISTIC_LIMIT
+SMALL_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+PUBLIC_EXPONENT = 65537
+
+
+def small_primes(limit: int) -> list:
+    """
+    Sieve of Eratosthenes.
+    >>> small_primes(20)
+    [2, 3, 5, 7, 11, 13, 17, 19]
+    """
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i, flag in enumerate(sieve) if flag]
+
+
+# Product of all primes below 2000: one gcd with it replaces ~300 trial divisions
+SMALL_PRIMES_PRODUCT = math.prod(small_primes(2000))
+
+
+def is_prime(n: int, rounds: int = 10) -> bool:
     """
+    Miller-Rabin test: exact below 3.3e24, otherwise wrong with
+    probability at most 4 ** -rounds.
     >>> is_prime(2)
     True
     >>> is_prime(11)
     True
     >>> is_prime(8)
     False
+    >>> is_prime(1)
+    False
+    >>> is_prime(561)
+    False
+    >>> is_prime(2 ** 127 - 1)
+    True
+    >>> is_prime(318665857834031151167461)  # strong pseudoprime to bases 2..37
+    False
     """
-    if n = 1:
+    if n < 2:
         return False
-    for i in range(2, n):
-        if n % i == 0:
+    for p in SMALL_BASES:
+        if n % p == 0:
+            return n == p
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    if n < DETERMINISTIC_LIMIT:
+        bases = SMALL_BASES
+    else:
+        bases = [2] + [random.randrange(3, n - 1) for _ in range(rounds)]
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
             return False
     return True
 
@@ -21,13 +81,26 @@ def gcd(a: int, b: int) -> int:
     3
     >>> gcd(3, 7)
     1
+    >>> gcd(0, 5)
+    5
     """
-    while a != b:
-        if a > b:
-            a = a - b
-        else:
-            b = b - a
-    return a
+    while b:
+        a, b = b, a % b
+    return abs(a)
+
+
+def extended_gcd(a: int, b: int) -> tuple:
+    """
+    Returns (g, x, y) such that a * x + b * y == g == gcd(a, b).
+    >>> extended_gcd(7, 40)
+    (1, -17, 3)
+    """
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
 
 
 def multiplicative_inverse(e: int, phi: int) -> int:
@@ -35,13 +108,87 @@ def multiplicative_inverse(e: int, phi: int) -> int:
     >>> multiplicative_inverse(7, 40)
     23
     """
-    n = 1
+    g, x, _ = extended_gcd(e, phi)
+    if g != 1:
+        raise ValueError('e and phi must be coprime.')
+    return x % phi
+
+
+def random_prime(bits: int) -> int:
+    """
+    Searches random odd `bits`-bit numbers with the two top bits set (so the
+    product of two such primes has exactly 2 * bits bits). Candidates sharing
+    a factor with a small prime are dropped before the Miller-Rabin test.
+    >>> p = random_prime(256)
+    >>> p.bit_length(), is_prime(p)
+    (256, True)
+    """
+    while True:
+        prime = _search_prime(bits, 1000)
+        if prime:
+            return prime
+
+
+def _search_prime(bits: int, attempts: int) -> int:
+    """ Try `attempts` random candidates, return a prime or 0 """
+    top = 0b11 << (bits - 2)
+    for _ in range(attempts):
+        candidate = secrets.randbits(bits) | top | 1
+        if math.gcd(candidate, SMALL_PRIMES_PRODUCT) == 1 and is_prime(candidate):
+            return candidate
+    return 0
+
+
+def random_prime_parallel(bits: int, pool: ProcessPoolExecutor, workers: int,
+                          attempts: int = 50) -> int:
+    """ Searches for a prime with `workers` tasks of `pool` trying their own candidates """
+    pending = {pool.submit(_search_prime, bits, attempts) for _ in range(workers)}
+    try:
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                prime = future.result()
+                if prime:
+                    return prime
+                pending.add(pool.submit(_search_prime, bits, attempts))
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def generate_large_keypair(bits: int = 2048, workers: int = None) -> tuple:
+    """
+    Generates a keypair with a `bits`-bit modulus from random primes,
+    optionally searching for primes in a pool of `workers` processes.
+    >>> public, private = generate_large_keypair(512)
+    >>> public[1].bit_length()
+    512
+    >>> decrypt(private, encrypt(public, 'RSA'))
+    'RSA'
+    """
+    return make_keypair(*random_primes(bits, workers))
+
+
+def random_primes(bits: int, workers: int = None) -> tuple:
+    """
+    Two distinct primes whose product has `bits` bits and suits PUBLIC_EXPONENT;
+    for odd `bits` the second prime is one bit longer.
+    >>> p, q = random_primes(129)
+    >>> (p * q).bit_length()
+    129
+    """
+    sizes = bits // 2, bits - bits // 2
+    if not workers:
+        return _find_primes(random_prime, sizes)
+    with ProcessPoolExecutor(workers) as pool:
+        return _find_primes(random_prime_parallel, sizes, pool, workers)
+
+
+def _find_primes(find_prime, sizes: tuple, *args) -> tuple:
     while True:
-        if ((n * phi) + 1) % e == 0:
-            break
-        n += 1
-    d = int(((n * phi) + 1) / e)
-    return d
+        p, q = (find_prime(size, *args) for size in sizes)
+        if p != q and gcd(PUBLIC_EXPONENT, (p - 1) * (q - 1)) == 1:
+            return p, q
 
 
 def generate_keypair(p: int, q: int) -> tuple:
@@ -49,13 +196,18 @@ def generate_keypair(p: int, q: int) -> tuple:
         raise ValueError('Both numbers must be prime.')
     elif p == q:
         raise ValueError('p and q cannot be equal')
+    return make_keypair(p, q)
+
 
+def make_keypair(p: int, q: int) -> tuple:
+    """ Builds a keypair from primes that are already known to be valid """
     n = p * q
 
     phi = (p - 1) * (q - 1)
 
-    # Choose an integer e such that e and phi(n) are coprime
-    e = random.randrange(1, phi)
+    # Choose an integer e such that e and phi(n) are coprime.
+    # A small public exponent keeps encryption cheap for large keys.
+    e = PUBLIC_EXPONENT if PUBLIC_EXPONENT < phi else random.randrange(1, phi)
 
     g = gcd(e, phi)
     while g != 1:
@@ -73,7 +225,7 @@ def encrypt(pk, plaintext):
     key, n = pk
     # Convert each letter in the plaintext to numbers based on
     # the character using a^b mod m
-    cipher = [(ord(char) ** key) % n for char in plaintext]
+    cipher = [pow(ord(char), key, n) for char in plaintext]
     # Return the array of bytes
     return cipher
 
@@ -82,11 +234,129 @@ def decrypt(pk, ciphertext):
     # Unpack the key into its components
     key, n = pk
     # Generate the plaintext based on the ciphertext and key using a^b mod m
-    plain = [chr((char ** key) % n) for char in ciphertext]
+    plain = [chr(pow(char, key, n)) for char in ciphertext]
     # Return the array of bytes as a string
     return ''.join(plain)
 
 
+class CRTKey(NamedTuple):
+    """ Private key with the values needed for Chinese Remainder Theorem decryption """
+    n: int
+    d: int
+    p: int
+    q: int
+    dp: int
+    dq: int
+    qinv: int
+
+
+def crt_private_key(p: int, q: int, e: int = PUBLIC_EXPONENT) -> CRTKey:
+    """
+    >>> crt_private_key(61, 53, 17)
+    CRTKey(n=3233, d=2753, p=61, q=53, dp=53, dq=49, qinv=38)
+    """
+    d = multiplicative_inverse(e, (p - 1) * (q - 1))
+    return CRTKey(p * q, d, p, q, d % (p - 1), d % (q - 1), multiplicative_inverse(q, p))
+
+
+def generate_block_keypair(bits: int = 2048, workers: int = None) -> tuple:
+    """ Returns public key (e, n) and a CRTKey for the block functions """
+    p, q = random_primes(bits, workers)
+    return (PUBLIC_EXPONENT, p * q), crt_private_key(p, q)
+
+
+def block_size(n: int) -> int:
+    """ Length in bytes of one ciphertext block for modulus n """
+    return (n.bit_length() + 7) // 8
+
+
+def pad_block(data: bytes, size: int) -> bytes:
+    """
+    PKCS#1 v1.5 encryption padding: 00 02 <non-zero random bytes> 00 <data>.
+    >>> block = pad_block(b'hi', 16)
+    >>> len(block), block[:2], block[-3:], 0 in block[2:-3]
+    (16, b'\\x00\\x02', b'\\x00hi', False)
+    """
+    length = size - 3 - len(data)
+    if length < 8:
+        raise ValueError('Data is too long for the block.')
+    padding = b''
+    while len(padding) < length:
+        padding += secrets.token_bytes(length - len(padding)).replace(b'\x00', b'')
+    return b'\x00\x02' + padding + b'\x00' + data
+
+
+def unpad_block(block: bytes) -> bytes:
+    """
+    >>> unpad_block(pad_block(b'hi', 16))
+    b'hi'
+    """
+    if block[:2] != b'\x00\x02':
+        raise ValueError('Decryption error.')
+    separator = block.find(0, 2)
+    if separator < 10:
+        raise ValueError('Decryption error.')
+    return block[separator + 1:]
+
+
+def encrypt_blocks(pk, plaintext: bytes) -> bytes:
+    """
+    Encrypts bytes in blocks of the modulus size, each block carrying up to
+    size - 11 bytes of the message. Returns the concatenated blocks.
+    """
+    key, n = pk
+    size = block_size(n)
+    chunk = size - 11
+    if chunk <= 0:
+        raise ValueError('Modulus is too small for block encryption.')
+    blocks = []
+    for start in range(0, len(plaintext), chunk):
+        m = int.from_bytes(pad_block(plaintext[start:start + chunk], size), 'big')
+        blocks.append(pow(m, key, n).to_bytes(size, 'big'))
+    return b''.join(blocks)
+
+
+def decrypt_block(pk, c: int) -> int:
+    """
+    Private-key operation. A CRTKey makes two half-size exponentiations
+    modulo p and q instead of one full-size one.
+    >>> key = crt_private_key(61, 53, 17)
+    >>> decrypt_block(key, 2790), decrypt_block((key.d, key.n), 2790)
+    (65, 65)
+    """
+    if isinstance(pk, CRTKey):
+        m1 = pow(c, pk.dp, pk.p)
+        m2 = pow(c, pk.dq, pk.q)
+        h = pk.qinv * (m1 - m2) % pk.p
+        return m2 + h * pk.q
+    key, n = pk
+    return pow(c, key, n)
+
+
+def decrypt_blocks(pk, ciphertext: bytes) -> bytes:
+    """
+    Decrypts the output of encrypt_blocks with a CRTKey or a (d, n) key.
+    >>> public, private = generate_block_keypair(512)
+    >>> message = b'Hello, World! ' * 10
+    >>> ciphertext = encrypt_blocks(public, message)
+    >>> len(ciphertext)
+    192
+    >>> decrypt_blocks(private, ciphertext) == message
+    True
+    >>> decrypt_blocks((private.d, private.n), ciphertext) == message
+    True
+    """
+    n = pk.n if isinstance(pk, CRTKey) else pk[1]
+    size = block_size(n)
+    if len(ciphertext) % size:
+        raise ValueError('Ciphertext length is not a multiple of the block size.')
+    plain = []
+    for start in range(0, len(ciphertext), size):
+        c = int.from_bytes(ciphertext[start:start + size], 'big')
+        plain.append(unpad_block(decrypt_block(pk, c).to_bytes(size, 'big')))
+    return b''.join(plain)
+
+
 if __name__ == '__main__':
     print("RSA Encrypter/ Decrypter")
     p = int(input("Enter a prime number (17, 19, 23, etc): "))
@@ -0,0 +1,134 @@
+import argparse
+import sys
+
+from caesar import make_table
+from vigenere import apply_tables, make_tables
+
+CHUNK_SIZE = 1 << 16
+
+
+def read_chunks(fileobj, chunk_size: int = CHUNK_SIZE):
+    """
+    Yields fixed-size chunks of a text or binary file object.
+    >>> import io
+    >>> list(read_chunks(io.StringIO("abcde"), 2))
+    ['ab', 'cd', 'e']
+    """
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def translate_stream(chunks, tables: list):
+    """
+    Translates an iterable of str or bytes chunks, carrying the key position
+    over chunk boundaries so the result matches a single in-memory call.
+    >>> ''.join(translate_stream(["ATTAC", "KATDA", "WN"], make_tables("LEMON")))
+    'LXFOPVEFRNHR'
+    """
+    offset = 0
+    for chunk in chunks:
+        yield apply_tables(chunk, tables, offset)
+        offset += len(chunk)
+
+
+def make_cipher_tables(cipher: str, key, decrypt: bool = False) -> list:
+    """
+    Returns translation tables for 'caesar' (key is the shift) or
+    'vigenere' (key is the keyword).
+    >>> len(make_cipher_tables('caesar', '3'))
+    1
+    >>> len(make_cipher_tables('vigenere', 'LEMON', decrypt=True))
+    5
+    """
+    if cipher == 'caesar':
+        shift = int(key)
+        return [make_table(-shift if decrypt else shift)]
+    if cipher == 'vigenere':
+        return make_tables(key, decrypt=decrypt)
+    raise ValueError(f'Unknown cipher: {cipher}')
+
+
+def encrypt_caesar_stream(chunks, shift: int = 3):
+    """
+    >>> list(encrypt_caesar_stream(["PYT", "HON"]))
+    ['SBW', 'KRQ']
+    """
+    return translate_stream(chunks, make_cipher_tables('caesar', shift))
+
+
+def decrypt_caesar_stream(chunks, shift: int = 3):
+    """
+    >>> list(decrypt_caesar_stream([b"SBW", b"KRQ"]))
+    [b'PYT', b'HON']
+    """
+    return translate_stream(chunks, make_cipher_tables('caesar', shift, decrypt=True))
+
+
+def encrypt_vigenere_stream(chunks, keyword: str):
+    """
+    >>> list(encrypt_vigenere_stream(["ATTACKA", "TDAWN"], "LEMON"))
+    ['LXFOPVE', 'FRNHR']
+    """
+    return translate_stream(chunks, make_cipher_tables('vigenere', keyword))
+
+
+def decrypt_vigenere_stream(chunks, keyword: str):
+    """
+    >>> list(decrypt_vigenere_stream([b"LXFOPVE", b"FRNHR"], "LEMON"))
+    [b'ATTACKA', b'TDAWN']
+    """
+    return translate_stream(chunks, make_cipher_tables('vigenere', keyword, decrypt=True))
+
+
+def translate_file(src, dst, tables: list, chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Translates file object `src` into `dst` chunk by chunk in constant memory.
+    >>> import io
+    >>> dst = io.StringIO()
+    >>> translate_file(io.StringIO("ATTACKATDAWN"), dst, make_tables("LEMON"), 5)
+    >>> dst.getvalue()
+    'LXFOPVEFRNHR'
+    """
+    for piece in translate_stream(read_chunks(src, chunk_size), tables):
+        dst.write(piece)
+
+
+def open_file(path: str, mode: str, binary: bool):
+    """ Open a file, '-' meaning stdin/stdout """
+    if path == '-':
+        stream = sys.stdin if 'r' in mode else sys.stdout
+        return stream.buffer if binary else stream
+    if binary:
+        return open(path, mode + 'b')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Encrypt or decrypt a file in chunks.')
+    parser.add_argument('cipher', choices=['caesar', 'vigenere'])
+    parser.add_argument('action', choices=['encrypt', 'decrypt'])
+    parser.add_argument('key', help='shift for caesar, keyword for vigenere')
+    parser.add_argument('input', help="input file or '-' for stdin")
+    parser.add_argument('output', help="output file or '-' for stdout")
+    parser.add_argument('--binary', action='store_true',
+                        help='work on raw bytes instead of UTF-8 text')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    tables = make_cipher_tables(args.cipher, args.key, args.action == 'decrypt')
+    src = open_file(args.input, 'r', args.binary)
+    dst = open_file(args.output, 'w', args.binary)
+    try:
+        translate_file(src, dst, tables, args.chunk_size)
+    finally:
+        if args.input != '-':
+            src.close()
+        if args.output != '-':
+            dst.close()
+
+
+if __name__ == '__main__':
+    main()
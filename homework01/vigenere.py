@@ -1,3 +1,61 @@
+import string
+
+from caesar import make_table
+
+
+def key_shifts(keyword: str) -> list:
+    """
+    Converts the letters of a keyword into shifts, skipping everything else.
+    >>> key_shifts("LEMON")
+    [11, 4, 12, 14, 13]
+    >>> key_shifts("a-b")
+    [0, 1]
+    """
+    shifts = [ord(c.lower()) - 97 for c in keyword if c in string.ascii_letters]
+    if not shifts:
+        raise ValueError('Keyword must contain at least one letter.')
+    return shifts
+
+
+def make_tables(keyword: str, decrypt: bool = False) -> list:
+    """
+    Builds one translation table per key position.
+    >>> len(make_tables("LEMON"))
+    5
+    """
+    sign = -1 if decrypt else 1
+    return [make_table(sign * shift) for shift in key_shifts(keyword)]
+
+
+def apply_tables(data, tables: list, offset: int = 0):
+    """
+    Translates str or bytes with a table per key position, starting at
+    key position `offset`. Each key position is handled as one strided
+    slice instead of character by character.
+    >>> apply_tables("ATTACKATDAWN", make_tables("LEMON"))
+    'LXFOPVEFRNHR'
+    >>> apply_tables(b"TACKATDAWN", make_tables("LEMON"), offset=2)
+    b'FOPVEFRNHR'
+    >>> apply_tables("ЖATTACK", make_tables("LEMON"))
+    'ЖEFHNNO'
+    """
+    m = len(tables)
+    offset %= m
+    tables = tables[offset:] + tables[:offset]
+    if m == 1:
+        return data.translate(tables[0])
+    if isinstance(data, str):
+        if data.isascii():
+            return apply_tables(data.encode('ascii'), tables).decode('ascii')
+        chars = list(data)
+        for i in range(m):
+            chars[i::m] = data[i::m].translate(tables[i])
+        return ''.join(chars)
+    out = bytearray(len(data))
+    for i in range(m):
+        out[i::m] = data[i::m].translate(tables[i])
+    return bytes(out)
+
 
 def encrypt_vigenere(plaintext: str, keyword: str) -> str:
     """
@@ -9,29 +67,7 @@ def encrypt_vigenere(plaintext: str, keyword: str) -> str:
     >>> encrypt_vigenere("ATTACKATDAWN", "LEMON")
     'LXFOPVEFRNHR'
     """
-    ciphertext = ""
-    keyword1 = []
-    for i in range(len(keyword)):
-        if keyword[i].isupper():
-            keyword1.append(ord(keyword[i]) - 65)
-        if keyword[i].islower():
-            keyword1.append(ord(keyword[i]) - 97)
-    if len(plaintext) > len(keyword1):
-        keyword1 *= len(plaintext) // len(keyword1) + 1
-    for i in range(len(plaintext)):
-        if plaintext[i].islower():
-            if (ord(plaintext[i]) + keyword1[i]) > 122:
-                ciphertext += chr(ord(plaintext[i]) + keyword1[i] - 26)
-            else:
-                ciphertext += chr(ord(plaintext[i]) + keyword1[i])
-        elif plaintext[i].isupper():
-            if (ord(plaintext[i]) + keyword1[i]) > 90:
-                ciphertext += chr(ord(plaintext[i]) + keyword1[i] - 26)
-            else:
-                ciphertext += chr(ord(plaintext[i]) + keyword1[i])
-        else:
-            ciphertext += plaintext[i]
-    return ciphertext
+    return apply_tables(plaintext, make_tables(keyword))
 
 
 def decrypt_vigenere(ciphertext: str, keyword: str) -> str:
@@ -44,26 +80,22 @@ def decrypt_vigenere(ciphertext: str, keyword: str) -> str:
     >>> decrypt_vigenere("LXFOPVEFRNHR", "LEMON")
     'ATTACKATDAWN'
     """
-    plaintext = ""
-    keyword1 = []
-    for i in range(len(keyword)):
-        if keyword[i].isupper():
-            keyword1.append(ord(keyword[i]) - 65)
-        if keyword[i].islower():
-            keyword1.append(ord(keyword[i]) - 97)
-    if len(ciphertext) > len(keyword1):
-        keyword1 *= len(ciphertext) // len(keyword1) + 1
-    for i in range(len(ciphertext)):
-        if ciphertext[i].islower():
-            if (ord(ciphertext[i]) - keyword1[i]) < 97:
-                plaintext += chr(ord(ciphertext[i]) - keyword1[i] + 26)
-            else:
-                plaintext += chr(ord(ciphertext[i]) - keyword1[i])
-        elif ciphertext[i].isupper():
-            if (ord(ciphertext[i]) - keyword1[i]) < 65:
-                plaintext += chr(ord(ciphertext[i]) - keyword1[i] + 26)
-            else:
-                plaintext += chr(ord(ciphertext[i]) - keyword1[i])
-        else:
-            plaintext += ciphertext[i]
-    return plaintext
+    return apply_tables(ciphertext, make_tables(keyword, decrypt=True))
+
+
+def encrypt_vigenere_bytes(plaintext: bytes, keyword: str) -> bytes:
+    """
+    Encrypts ASCII letters of a bytes object using a Vigenere cipher.
+    >>> encrypt_vigenere_bytes(b"attack at dawn", "LEMON")
+    b'lxfopv mh oeib'
+    """
+    return apply_tables(plaintext, make_tables(keyword))
+
+
+def decrypt_vigenere_bytes(ciphertext: bytes, keyword: str) -> bytes:
+    """
+    Decrypts ASCII letters of a bytes object using a Vigenere cipher.
+    >>> decrypt_vigenere_bytes(b"lxfopv mh oeib", "LEMON")
+    b'attack at dawn'
+    """
+    return apply_tables(ciphertext, make_tables(keyword, decrypt=True))
@@ -0,0 +1,100 @@
+""" Пакетное решение Судоку из файлов вида "одна головоломка - одна строка из 81 символа" """
+import argparse
+import collections
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sudoku import BACKENDS
+
+CHUNK_SIZE = 500
+
+
+def read_puzzles(filename: str):
+    """ Лениво читать головоломки из файла; пустые строки и строки с '#' пропускаются,
+    '0' считается пустой клеткой
+    >>> next(read_puzzles('puzzle1.txt'))[:9]
+    '53..7....'
+    """
+    with open(filename) as f:
+        buffer = ''
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            buffer += line.replace('0', '.')
+            # Поддерживаются и файлы, где головоломка занимает 9 строк
+            if len(buffer) >= 81:
+                yield buffer[:81]
+                buffer = ''
+
+
+def chunked(iterable, size: int):
+    """ Разбить поток на списки по size элементов
+    >>> list(chunked('abcde', 2))
+    [['a', 'b'], ['c', 'd'], ['e']]
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_chunk(puzzles: list, backend: str = 'bitmask') -> list:
+    """ Решить пачку головоломок; для головоломок без решения - пустая строка """
+    solver = BACKENDS[backend]
+    return [solver(puzzle) or '' for puzzle in puzzles]
+
+
+def solve_stream(puzzles, workers: int = None, chunk_size: int = CHUNK_SIZE,
+                 backend: str = 'bitmask'):
+    """
+    Решать поток головоломок в пуле процессов, отдавая решения в исходном
+    порядке. Одновременно в работе не больше 2 * workers пачек, поэтому
+    память не зависит от длины входа.
+    >>> list(solve_stream(read_puzzles('puzzle1.txt'), workers=1))[0][:9]
+    '534678912'
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        limit = 2 * workers
+        pending = collections.deque()
+        for chunk in chunked(puzzles, chunk_size):
+            pending.append(pool.submit(solve_chunk, chunk, backend))
+            if len(pending) >= limit:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def solve_file(src: str, dst: str, workers: int = None, chunk_size: int = CHUNK_SIZE,
+               backend: str = 'bitmask') -> int:
+    """ Решить все головоломки из src и записать решения в dst по одной в строке """
+    count = 0
+    with open(dst, 'w') as out:
+        for solution in solve_stream(read_puzzles(src), workers, chunk_size, backend):
+            out.write(solution + '\n')
+            count += 1
+    return count
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Решение Судоку из файла в пуле процессов')
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--backend', choices=list(BACKENDS), default='bitmask')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = solve_file(args.input, args.output, args.workers, args.chunk_size, args.backend)
+    elapsed = time.perf_counter() - start
+    print(f'{count} головоломок за {elapsed:.2f} с, {count / elapsed:.0f} в секунду')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+import batch
+import nsudoku
+import sudoku
+from compact import CompactGrid
+
+from sudoku import BACKENDS, read_sudoku
+
+# Перебор без распространения ограничений
+SLOW_BACKENDS = ('backtracking', 'compact')
+
+# Трудные головоломки: Инкалы, AI Escargot, одна из самых трудных у Норвига
+# и его же головоломка с несколькими решениями, на которой поиск без
+# точного покрытия застревает надолго
+HARD_PUZZLES = [
+    '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+    '1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..',
+    '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+    '.....6....59.....82....8....45........3........6..3.54...325..6..................',
+]
+
+
+def load_corpus() -> list:
+    files = ['puzzle1.txt', 'puzzle2.txt', 'puzzle3.txt']
+    easy = [''.join(''.join(row) for row in read_sudoku(fname)) for fname in files]
+    return easy, HARD_PUZZLES
+
+
+def bench(name: str, corpus: str, puzzles: list) -> None:
+    solver = BACKENDS[name]
+    times = []
+    for puzzle in puzzles:
+        start = time.perf_counter()
+        solver(puzzle)
+        times.append(time.perf_counter() - start)
+    print(f'{name:<14}{corpus:<8}{len(puzzles):>4}{sum(times) * 1000:12.1f}{max(times) * 1000:12.1f}')
+
+
+def per_call(func, *args, number: int = 10000) -> float:
+    """ Среднее время вызова в микросекундах """
+    start = time.perf_counter()
+    for _ in range(number):
+        func(*args)
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def bench_compact() -> None:
+    """ Память и задержка: список списков против CompactGrid """
+    grid = read_sudoku('puzzle1.txt')
+    compact_grid = CompactGrid.from_grid(grid)
+    solution = sudoku.solve(read_sudoku('puzzle1.txt'))
+    compact_solution = CompactGrid.from_grid(solution)
+    list_size = sys.getsizeof(grid) + sum(sys.getsizeof(row) for row in grid)
+    compact_size = sys.getsizeof(compact_grid) + sys.getsizeof(compact_grid.cells)
+    rows = [
+        ('memory, bytes', list_size, compact_size),
+        ('possible values, us', per_call(sudoku.find_possible_values, grid, (4, 7)),
+         per_call(compact_grid.possible_values, 43)),
+        ('check_solution, us', per_call(sudoku.check_solution, solution, number=1000),
+         per_call(sudoku.check_solution, compact_solution, number=1000)),
+    ]
+    print(f'{"":<22}{"list":>10}{"compact":>10}')
+    for name, list_value, compact_value in rows:
+        print(f'{name:<22}{list_value:10.1f}{compact_value:10.1f}')
+
+
+def bench_batch(count: int = 20000) -> None:
+    """ Скорость пакетного решения в зависимости от числа процессов """
+    easy, hard = load_corpus()
+    corpus = easy + hard[:-1]
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'puzzles.txt')
+        dst = os.path.join(tmp, 'solutions.txt')
+        with open(src, 'w') as f:
+            for i in range(count):
+                f.write(corpus[i % len(corpus)] + '\n')
+        print(f'{"workers":<10}{"puzzles/s":>12}')
+        for workers in range(1, (os.cpu_count() or 1) + 1):
+            start = time.perf_counter()
+            solved = batch.solve_file(src, dst, workers)
+            print(f'{workers:<10}{solved / (time.perf_counter() - start):12.0f}')
+
+
+# Размер поля и доля пустых клеток
+SIZES = ((9, 0.6), (16, 0.6), (25, 0.5))
+# Лимит узлов на попытку в bench_sizes: отдельные головоломки 25x25 решаются
+# секундами, и без лимита время замера непредсказуемо
+SIZES_MAX_BUDGET = 1 << 12
+
+
+def bench_sizes(count: int = 10, seed: int = 1) -> None:
+    """ Время решения случайных головоломок 9x9, 16x16 и 25x25 обобщенным решателем;
+    capped - сколько головоломок не решено в пределах SIZES_MAX_BUDGET """
+    rng = random.Random(seed)
+    print(f'{"size":<10}{"holes":>8}{"n":>4}{"mean, ms":>12}{"max, ms":>12}{"capped":>8}')
+    for size, holes in SIZES:
+        times = []
+        capped = 0
+        for _ in range(count):
+            puzzle = nsudoku.random_puzzle(size, holes, rng)
+            start = time.perf_counter()
+            board = nsudoku.parse(puzzle)
+            solved = nsudoku.solve_board(board, max_budget=SIZES_MAX_BUDGET) if board else None
+            times.append(time.perf_counter() - start)
+            # Головоломки построены из решенного поля, так что решение есть
+            capped += solved is None
+        print(f'{size:<10}{holes:>8}{count:>4}{sum(times) / count * 1000:12.1f}{max(times) * 1000:12.1f}'
+              f'{capped:>8}')
+
+
+if __name__ == '__main__':
+    # Перебор на трудных головоломках работает очень долго, поэтому по умолчанию
+    # он запускается только на puzzle1..3; --all включает его везде
+    easy, hard = load_corpus()
+    print(f'{"backend":<14}{"corpus":<8}{"n":>4}{"total, ms":>12}{"max, ms":>12}')
+    for name in BACKENDS:
+        bench(name, 'easy', easy)
+    for name in BACKENDS:
+        if name not in SLOW_BACKENDS or '--all' in sys.argv:
+            bench(name, 'hard', hard)
+    bench_compact()
+    bench_sizes()
+    bench_batch()
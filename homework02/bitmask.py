@@ -0,0 +1,191 @@
+""" Решатель Судоку на битовых масках кандидатов с распространением ограничений """
+import itertools
+import random
+
+DIGITS = '123456789'
+ALL = (1 << 9) - 1
+
+ROWS = [[r * 9 + c for c in range(9)] for r in range(9)]
+COLS = [[r * 9 + c for r in range(9)] for c in range(9)]
+BOXES = [[(br + r) * 9 + bc + c for r in range(3) for c in range(3)]
+         for br in (0, 3, 6) for bc in (0, 3, 6)]
+UNITS = ROWS + COLS + BOXES
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [i // 27 * 3 + i % 9 // 3 for i in range(81)]
+
+# Число единичных битов и номер цифры для одиночного бита
+POPCOUNT = [bin(mask).count('1') for mask in range(ALL + 1)]
+DIGIT_OF_BIT = {1 << d: d for d in range(9)}
+
+
+class Board:
+    """ Значения клеток (-1 - пусто) и занятые цифры в строках, столбцах и квадратах """
+
+    __slots__ = ('values', 'rows', 'cols', 'boxes')
+
+    def __init__(self, values=None, rows=None, cols=None, boxes=None) -> None:
+        self.values = values if values is not None else [-1] * 81
+        self.rows = rows if rows is not None else [0] * 9
+        self.cols = cols if cols is not None else [0] * 9
+        self.boxes = boxes if boxes is not None else [0] * 9
+
+    def copy(self) -> 'Board':
+        return Board(self.values[:], self.rows[:], self.cols[:], self.boxes[:])
+
+    def candidates(self, cell: int) -> int:
+        """ Битовая маска цифр, которые можно поставить в клетку """
+        return ALL & ~(self.rows[ROW_OF[cell]] | self.cols[COL_OF[cell]] | self.boxes[BOX_OF[cell]])
+
+    def place(self, cell: int, digit: int) -> bool:
+        """ Поставить цифру, вернуть False, если она уже занята в одном из блоков """
+        bit = 1 << digit
+        r, c, b = ROW_OF[cell], COL_OF[cell], BOX_OF[cell]
+        if (self.rows[r] | self.cols[c] | self.boxes[b]) & bit:
+            return False
+        self.values[cell] = digit
+        self.rows[r] |= bit
+        self.cols[c] |= bit
+        self.boxes[b] |= bit
+        return True
+
+
+def parse(puzzle: str) -> Board:
+    """ Прочитать строку из 81 символа, пустые клетки - '.' или '0' """
+    board = Board()
+    for cell, ch in enumerate(puzzle):
+        if ch in DIGITS and not board.place(cell, DIGITS.index(ch)):
+            return None
+    return board
+
+
+def propagate(board: Board, hidden: bool = True) -> bool:
+    """
+    Расставить одиночки: клетки с единственным кандидатом (naked singles)
+    и, если hidden, цифры с единственным местом в блоке (hidden singles).
+    Вернуть False, если найдено противоречие.
+    """
+    values = board.values
+    changed = True
+    while changed:
+        changed = False
+        cand = [0] * 81
+        for cell in range(81):
+            if values[cell] < 0:
+                mask = board.candidates(cell)
+                if not mask:
+                    return False
+                if POPCOUNT[mask] == 1:
+                    if not board.place(cell, DIGIT_OF_BIT[mask]):
+                        return False
+                    changed = True
+                else:
+                    cand[cell] = mask
+        if changed or not hidden:
+            continue
+        for unit in UNITS:
+            once = twice = placed = 0
+            for cell in unit:
+                if values[cell] >= 0:
+                    placed |= 1 << values[cell]
+                else:
+                    mask = cand[cell]
+                    twice |= once & mask
+                    once |= mask
+            if (once | placed) != ALL:
+                return False
+            singles = once & ~twice
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for cell in unit:
+                    if cand[cell] & bit:
+                        if values[cell] >= 0 or not board.place(cell, DIGIT_OF_BIT[bit]):
+                            return False
+                        changed = True
+                        break
+            if changed:
+                break
+    return True
+
+
+def search(board: Board, rng: random.Random = None, budget: list = None):
+    """ Поиск с возвратом, перебирающий все решения; ветвление идет по клетке
+    с наименьшим числом кандидатов. С rng цифры перебираются в случайном
+    порядке; budget - список из одного числа, сколько еще узлов можно посетить """
+    if budget is not None:
+        if budget[0] <= 0:
+            return
+        budget[0] -= 1
+    if not propagate(board):
+        return
+    best, best_mask, best_count = -1, 0, 10
+    for cell in range(81):
+        if board.values[cell] < 0:
+            mask = board.candidates(cell)
+            count = POPCOUNT[mask]
+            if count < best_count:
+                best, best_mask, best_count = cell, mask, count
+                if count == 2:
+                    break
+    if best < 0:
+        yield board
+        return
+    digits = [d for d in range(9) if best_mask >> d & 1]
+    if rng is not None:
+        rng.shuffle(digits)
+    for digit in digits:
+        child = board.copy()
+        child.place(best, digit)
+        yield from search(child, rng, budget)
+
+
+def solve_board(board: Board, first_budget: int = 100) -> Board:
+    """
+    Время перебора имеет тяжелый хвост: на некоторых головоломках неудачный
+    порядок цифр в начале стоит десятки секунд. Поэтому поиск, как в
+    nsudoku, перезапускается со случайным порядком и удваивающимся лимитом
+    узлов. Если поиск уложился в лимит и ничего не нашел, решения нет.
+    """
+    budget = first_budget
+    for attempt in itertools.count():
+        remaining = [budget]
+        rng = random.Random(attempt) if attempt else None
+        solved = next(search(board.copy(), rng, remaining), None)
+        if solved is not None or remaining[0] > 0:
+            return solved
+        budget *= 2
+
+
+def count_solutions(puzzle: str, limit: int = None) -> int:
+    """ Число решений, но не больше limit, если он задан
+    >>> count_solutions('53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79')
+    1
+    >>> count_solutions('.' * 81, limit=2)
+    2
+    """
+    board = parse(puzzle)
+    if board is None:
+        return 0
+    count = 0
+    for _ in search(board):
+        count += 1
+        if count == limit:
+            break
+    return count
+
+
+def solve_string(puzzle: str) -> str:
+    """ Решить Судоку, заданное строкой из 81 символа; None, если решения нет
+    >>> solve_string('53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79')
+    '534678912672195348198342567859761423426853791713924856961537284287419635345286179'
+    >>> solve_string('11' + '.' * 79) is None
+    True
+    """
+    board = parse(puzzle)
+    if board is None:
+        return None
+    solved = solve_board(board)
+    if solved is None:
+        return None
+    return ''.join(DIGITS[d] for d in solved.values)
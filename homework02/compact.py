@@ -0,0 +1,155 @@
+""" Компактное поле Судоку: 81 байт и заранее вычисленные таблицы индексов """
+import array
+
+DIGITS = '123456789'
+
+ROW_CELLS = tuple(tuple(r * 9 + c for c in range(9)) for r in range(9))
+COL_CELLS = tuple(tuple(r * 9 + c for r in range(9)) for c in range(9))
+BOX_CELLS = tuple(tuple((br + r) * 9 + bc + c for r in range(3) for c in range(3))
+                  for br in (0, 3, 6) for bc in (0, 3, 6))
+UNIT_CELLS = ROW_CELLS + COL_CELLS + BOX_CELLS
+BOX_OF = tuple(i // 27 * 3 + i % 9 // 3 for i in range(81))
+# Для каждой клетки - 20 клеток, с которыми она делит строку, столбец или квадрат
+PEERS = tuple(
+    tuple(sorted((set(ROW_CELLS[i // 9]) | set(COL_CELLS[i % 9]) | set(BOX_CELLS[BOX_OF[i]])) - {i}))
+    for i in range(81)
+)
+# Код символа -> значение клетки (0 - пусто) и обратно
+TO_VALUE = bytes.maketrans(b'.0' + DIGITS.encode(), bytes([0, 0]) + bytes(range(1, 10)))
+TO_CHAR = bytes.maketrans(bytes(range(10)), b'.' + DIGITS.encode())
+FULL = 0b1111111110
+
+
+class CompactGrid:
+    """ Поле Судоку в array('B') из 81 элемента: 0 - пустая клетка, 1..9 - цифры
+    >>> grid = CompactGrid.from_string('53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79')
+    >>> grid[0, 1], grid[0, 2]
+    (3, 0)
+    >>> grid.to_grid()[0]
+    ['5', '3', '.', '.', '7', '.', '.', '.', '.']
+    """
+
+    __slots__ = ('cells',)
+
+    def __init__(self, cells=None) -> None:
+        self.cells = array.array('B', cells if cells is not None else bytes(81))
+
+    @classmethod
+    def from_string(cls, puzzle: str) -> 'CompactGrid':
+        return cls(puzzle.encode('ascii').translate(TO_VALUE))
+
+    @classmethod
+    def from_grid(cls, grid: list) -> 'CompactGrid':
+        """ Из списка списков строк, как возвращает sudoku.read_sudoku """
+        return cls.from_string(''.join(''.join(row) for row in grid))
+
+    def to_string(self) -> str:
+        return self.cells.tobytes().translate(TO_CHAR).decode('ascii')
+
+    def to_grid(self) -> list:
+        text = self.to_string()
+        return [list(text[i:i + 9]) for i in range(0, 81, 9)]
+
+    def __getitem__(self, pos: tuple) -> int:
+        return self.cells[pos[0] * 9 + pos[1]]
+
+    def __setitem__(self, pos: tuple, value: int) -> None:
+        self.cells[pos[0] * 9 + pos[1]] = value
+
+    def copy(self) -> 'CompactGrid':
+        return CompactGrid(self.cells)
+
+    def possible_values(self, cell: int) -> int:
+        """ Битовая маска допустимых значений (бит v - значение v) для клетки
+        >>> grid = CompactGrid.from_string('53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79')
+        >>> mask = grid.possible_values(2)
+        >>> [v for v in range(1, 10) if mask >> v & 1]
+        [1, 2, 4]
+        """
+        cells = self.cells
+        used = 0
+        for peer in PEERS[cell]:
+            used |= 1 << cells[peer]
+        return FULL & ~used
+
+    def find_empty(self) -> int:
+        """ Номер первой пустой клетки или -1 """
+        try:
+            return self.cells.index(0)
+        except ValueError:
+            return -1
+
+    def is_consistent(self) -> bool:
+        """ Нет ли одинаковых цифр в одной строке, столбце или квадрате
+        >>> CompactGrid.from_string('11' + '.' * 79).is_consistent()
+        False
+        """
+        cells = self.cells
+        for cell, value in enumerate(cells):
+            if value and not self.possible_values(cell) >> value & 1:
+                return False
+        return True
+
+    def is_solved(self) -> bool:
+        """ Все ли строки, столбцы и квадраты содержат цифры 1..9
+        >>> CompactGrid.from_string('534678912672195348198342567859761423426853791713924856961537284287419635345286179').is_solved()
+        True
+        >>> CompactGrid.from_string('.' * 81).is_solved()
+        False
+        """
+        cells = self.cells
+        for unit in UNIT_CELLS:
+            seen = 0
+            for cell in unit:
+                seen |= 1 << cells[cell]
+            if seen != FULL:
+                return False
+        return True
+
+    def display(self) -> None:
+        """ Вывод Судоку, как sudoku.display """
+        text = self.to_string()
+        width = 2
+        line = '+'.join(['-' * (width * 3)] * 3)
+        for row in range(9):
+            print(''.join(text[row * 9 + col].center(width) + ('|' if col in (2, 5) else '')
+                          for col in range(9)))
+            if row in (2, 5):
+                print(line)
+        print()
+
+
+def solve(grid: CompactGrid) -> bool:
+    """ Перебор с возвратом прямо на компактном поле; True, если решение найдено.
+    Поле с противоречивыми исходными цифрами решения не имеет.
+    >>> grid = CompactGrid.from_string('53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79')
+    >>> solve(grid), grid.to_string()
+    (True, '534678912672195348198342567859761423426853791713924856961537284287419635345286179')
+    >>> solve(CompactGrid.from_string('11' + '.' * 79))
+    False
+    """
+    return grid.is_consistent() and _search(grid)
+
+
+def _search(grid: CompactGrid) -> bool:
+    cell = grid.find_empty()
+    if cell < 0:
+        return True
+    mask = grid.possible_values(cell)
+    cells = grid.cells
+    for value in range(1, 10):
+        if mask >> value & 1:
+            cells[cell] = value
+            if _search(grid):
+                return True
+    cells[cell] = 0
+    return False
+
+
+def solve_string(puzzle: str) -> str:
+    """ Решить Судоку, заданное строкой из 81 символа; None, если решения нет
+    >>> print(solve_string('334678912672195348198342567859761423426853791713924856961537284287419635345286179'))
+    None
+    """
+    grid = CompactGrid.from_string(puzzle)
+    return grid.to_string() if solve(grid) else None
@@ -0,0 +1,176 @@
+""" Решатель Судоку как задачи точного покрытия: алгоритм X на танцующих ссылках """
+
+DIGITS = '123456789'
+COLUMNS = 4 * 81
+OPTIONS = 9 * 81
+
+
+def option_columns(option: int) -> tuple:
+    """ Номера ограничений (клетка, строка-цифра, столбец-цифра, квадрат-цифра) для варианта
+    >>> option_columns(0)
+    (0, 81, 162, 243)
+    """
+    cell, digit = divmod(option, 9)
+    row, col = divmod(cell, 9)
+    box = row // 3 * 3 + col // 3
+    return cell, 81 + row * 9 + digit, 162 + col * 9 + digit, 243 + box * 9 + digit
+
+
+def build_template() -> tuple:
+    """
+    Построить матрицу ссылок: узел 0 - корень, узлы 1..324 - заголовки
+    столбцов, далее по 4 узла на каждый из 729 вариантов (клетка, цифра).
+    """
+    size = 1 + COLUMNS + 4 * OPTIONS
+    left = list(range(-1, size - 1))
+    right = list(range(1, size + 1))
+    up = list(range(size))
+    down = list(range(size))
+    column = list(range(size))
+    option = [-1] * size
+    left[0], right[COLUMNS] = COLUMNS, 0
+    node = COLUMNS + 1
+    for opt in range(OPTIONS):
+        first = node
+        for col in option_columns(opt):
+            header = col + 1
+            column[node] = header
+            option[node] = opt
+            up[node] = up[header]
+            down[node] = header
+            down[up[header]] = node
+            up[header] = node
+            node += 1
+        left[first], right[node - 1] = node - 1, first
+    sizes = [9] * (COLUMNS + 1)
+    return left, right, up, down, column, option, sizes
+
+
+TEMPLATE = build_template()
+
+
+class ExactCover:
+    """ Танцующие ссылки для одной головоломки """
+
+    def __init__(self) -> None:
+        left, right, up, down, column, option, sizes = TEMPLATE
+        self.left = left[:]
+        self.right = right[:]
+        self.up = up[:]
+        self.down = down[:]
+        self.column = column
+        self.option = option
+        self.sizes = sizes[:]
+
+    def cover(self, c: int) -> None:
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, sizes = self.column, self.sizes
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                sizes[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, c: int) -> None:
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, sizes = self.column, self.sizes
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                sizes[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def select(self, opt: int) -> None:
+        """ Зафиксировать вариант (для заданных цифр) """
+        node = 1 + COLUMNS + 4 * opt
+        for k in range(4):
+            self.cover(self.column[node + k])
+
+    def search(self, partial: list):
+        """ Перебрать все точные покрытия, дополняющие partial """
+        right, down, sizes = self.right, self.down, self.sizes
+        c = right[0]
+        if c == 0:
+            yield partial
+            return
+        best, best_size = c, sizes[c]
+        while c != 0 and best_size > 1:
+            if sizes[c] < best_size:
+                best, best_size = c, sizes[c]
+            c = right[c]
+        if best_size == 0:
+            return
+        self.cover(best)
+        r = down[best]
+        while r != best:
+            partial.append(self.option[r])
+            j = right[r]
+            while j != r:
+                self.cover(self.column[j])
+                j = right[j]
+            yield from self.search(partial)
+            j = self.left[r]
+            while j != r:
+                self.uncover(self.column[j])
+                j = self.left[j]
+            partial.pop()
+            r = down[r]
+        self.uncover(best)
+
+
+def solutions(puzzle: str):
+    """ Генератор всех решений Судоку, заданного строкой из 81 символа """
+    matrix = ExactCover()
+    givens = []
+    used = set()
+    for cell, ch in enumerate(puzzle):
+        if ch in DIGITS:
+            opt = cell * 9 + DIGITS.index(ch)
+            cols = option_columns(opt)
+            if used.intersection(cols):
+                return
+            used.update(cols)
+            matrix.select(opt)
+            givens.append(opt)
+    for chosen in matrix.search(givens):
+        values = [''] * 81
+        for opt in chosen:
+            values[opt // 9] = DIGITS[opt % 9]
+        yield ''.join(values)
+
+
+def solve_string(puzzle: str) -> str:
+    """ Решить Судоку, заданное строкой из 81 символа; None, если решения нет
+    >>> solve_string('53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79')
+    '534678912672195348198342567859761423426853791713924856961537284287419635345286179'
+    >>> solve_string('11' + '.' * 79) is None
+    True
+    """
+    return next(solutions(puzzle), None)
+
+
+def count_solutions(puzzle: str, limit: int = None) -> int:
+    """ Число решений, но не больше limit, если он задан
+    >>> count_solutions('534678912672195348198342567859761423426853791713924856961537284287419635345286179')
+    1
+    >>> count_solutions('.' * 81, limit=2)
+    2
+    """
+    count = 0
+    for _ in solutions(puzzle):
+        count += 1
+        if count == limit:
+            break
+    return count
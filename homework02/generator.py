@@ -0,0 +1,102 @@
+""" Генерация Судоку с единственным решением и оценкой сложности """
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import bitmask
+
+LEVELS = ('easy', 'medium', 'hard')
+
+
+def random_solution(rng: random.Random = random) -> str:
+    """ Случайное заполненное поле: три диагональных квадрата не зависят друг
+    от друга, поэтому заполняются случайными перестановками, остальное
+    достраивает решатель
+    >>> bitmask.count_solutions(random_solution())
+    1
+    """
+    values = ['.'] * 81
+    for box in (0, 4, 8):
+        digits = rng.sample(bitmask.DIGITS, 9)
+        for cell, digit in zip(bitmask.BOXES[box], digits):
+            values[cell] = digit
+    return bitmask.solve_string(''.join(values))
+
+
+def grade(puzzle: str) -> str:
+    """ Сложность по приемам, которых хватает для решения:
+    'easy' - только одиночки в клетках, 'medium' - еще и скрытые одиночки,
+    'hard' - нужен перебор
+    >>> grade('53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79')
+    'easy'
+    >>> grade('8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..')
+    'hard'
+    """
+    for level, hidden in (('easy', False), ('medium', True)):
+        board = bitmask.parse(puzzle)
+        if bitmask.propagate(board, hidden) and min(board.values) >= 0:
+            return level
+    return 'hard'
+
+
+def generate_unique(rng: random.Random = random, min_clues: int = 17, level: str = None) -> str:
+    """ Убирать подсказки в случайном порядке, пока решение остается единственным;
+    проверка останавливает подсчет решений на втором. Если задан level,
+    подсказка остается и тогда, когда без нее головоломка стала бы сложнее
+    этого уровня
+    >>> puzzle = generate_unique()
+    >>> bitmask.count_solutions(puzzle)
+    1
+    >>> grade(generate_unique(level='easy'))
+    'easy'
+    """
+    # Самый сложный уровень (перебор) ничем не ограничен, его можно не оценивать
+    limited = level is not None and level != LEVELS[-1]
+    values = list(random_solution(rng))
+    cells = list(range(81))
+    rng.shuffle(cells)
+    clues = 81
+    for cell in cells:
+        if clues <= min_clues:
+            break
+        digit, values[cell] = values[cell], '.'
+        puzzle = ''.join(values)
+        if bitmask.count_solutions(puzzle, limit=2) == 1 and (
+                not limited or LEVELS.index(grade(puzzle)) <= LEVELS.index(level)):
+            clues -= 1
+        else:
+            values[cell] = digit
+    return ''.join(values)
+
+
+def generate_graded(level: str = None, rng: random.Random = random) -> tuple:
+    """ Сгенерировать головоломку нужной сложности (любой, если level не задан).
+    Сложность ограничивается уже при удалении подсказок, поэтому повторять
+    приходится, только если головоломка вышла проще нужной
+    """
+    while True:
+        puzzle = generate_unique(rng, level=level)
+        puzzle_level = grade(puzzle)
+        if level is None or puzzle_level == level:
+            return puzzle, puzzle_level
+
+
+def _generate_chunk(count: int, level: str, seed: int) -> list:
+    # У каждой задачи свой генератор: после fork все процессы получили бы
+    # одно и то же состояние модуля random
+    rng = random.Random(seed)
+    return [generate_graded(level, rng) for _ in range(count)]
+
+
+def generate_many(count: int, level: str = None, workers: int = None,
+                  chunk_size: int = 50) -> list:
+    """ Сгенерировать count головоломок в пуле процессов; список пар (головоломка, сложность)
+    >>> puzzles = generate_many(4, workers=2, chunk_size=2)
+    >>> len(puzzles), len(set(puzzles))
+    (4, 4)
+    """
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_generate_chunk, min(chunk_size, count - start), level,
+                               int.from_bytes(os.urandom(8), 'big'))
+                   for start in range(0, count, chunk_size)]
+        return [puzzle for future in futures for puzzle in future.result()]
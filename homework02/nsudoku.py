@@ -0,0 +1,277 @@
+""" Судоку произвольного размера N x N, N = n * n (9x9, 16x16, 25x25) """
+import functools
+import itertools
+import math
+import random
+
+ALPHABETS = {
+    4: '1234',
+    9: '123456789',
+    16: '0123456789ABCDEF',
+    25: 'ABCDEFGHIJKLMNOPQRSTUVWXY',
+}
+EMPTY = '.'
+
+
+class Geometry:
+    """ Таблицы индексов для поля со стороной квадрата n """
+
+    def __init__(self, n: int) -> None:
+        size = n * n
+        self.n = n
+        self.size = size
+        self.cells = size * size
+        self.all = (1 << size) - 1
+        # Счетчик заполненной клетки или цифры, уже стоящей в блоке; больше
+        # любого настоящего счетчика, поэтому min() его не выбирает
+        self.done = size + 1
+        self.row_of = [i // size for i in range(self.cells)]
+        self.col_of = [i % size for i in range(self.cells)]
+        self.box_of = [i // size // n * n + i % size // n for i in range(self.cells)]
+        rows = [[r * size + c for c in range(size)] for r in range(size)]
+        cols = [[r * size + c for r in range(size)] for c in range(size)]
+        boxes = [[] for _ in range(size)]
+        for i in range(self.cells):
+            boxes[self.box_of[i]].append(i)
+        self.units = rows + cols + boxes
+        # Номера блоков клетки: строка, столбец и квадрат
+        self.units_of = [(self.row_of[i], size + self.col_of[i], 2 * size + self.box_of[i])
+                         for i in range(self.cells)]
+        self.peers = [
+            sorted((set(rows[self.row_of[i]]) | set(cols[self.col_of[i]]) |
+                    set(boxes[self.box_of[i]])) - {i})
+            for i in range(self.cells)
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def geometry(size: int) -> Geometry:
+    n = math.isqrt(size)
+    if n * n != size:
+        raise ValueError(f'Side {size} is not a square number')
+    return Geometry(n)
+
+
+class Board:
+    """
+    Значения клеток (-1 - пусто), битовые маски кандидатов пустых клеток
+    (у заполненных клеток маска 0) и два вида счетчиков: сколько кандидатов
+    у каждой клетки (`counts`) и сколько мест у каждой цифры в каждом блоке
+    (`places`, индекс unit * size + value). Все это обновляется при каждой
+    расстановке, а не пересчитывается заново; у заполненных клеток и
+    расставленных цифр счетчик равен `geo.done`.
+    """
+
+    __slots__ = ('geo', 'values', 'cand', 'counts', 'places')
+
+    def __init__(self, geo: Geometry, values=None, cand=None, counts=None, places=None) -> None:
+        self.geo = geo
+        self.values = values if values is not None else [-1] * geo.cells
+        self.cand = cand if cand is not None else [geo.all] * geo.cells
+        self.counts = counts if counts is not None else [geo.size] * geo.cells
+        self.places = places if places is not None else [geo.size] * (len(geo.units) * geo.size)
+
+    def copy(self) -> 'Board':
+        return Board(self.geo, self.values[:], self.cand[:], self.counts[:], self.places[:])
+
+    def assign(self, cell: int, value: int) -> bool:
+        """ Поставить значение и убрать его из кандидатов соседей. Клетки, где
+        остался один кандидат, и цифры, у которых в блоке осталось одно место
+        (одиночки), заполняются сразу. False при противоречии """
+        geo = self.geo
+        size, done, units, units_of, peers = geo.size, geo.done, geo.units, geo.units_of, geo.peers
+        values, cand, counts, places = self.values, self.cand, self.counts, self.places
+        stack = [(cell, value)]
+        # Индексы places, где у цифры осталось одно место; клетка ищется потом
+        hidden = []
+        while stack or hidden:
+            if not stack:
+                index = hidden.pop()
+                if places[index] == done:
+                    continue
+                unit, value = divmod(index, size)
+                bit = 1 << value
+                stack.extend((other, value) for other in units[unit] if cand[other] & bit)
+                continue
+            cell, value = stack.pop()
+            if values[cell] >= 0:
+                if values[cell] != value:
+                    return False
+                continue
+            bit = 1 << value
+            mask = cand[cell]
+            if not mask & bit:
+                return False
+            values[cell] = value
+            cand[cell] = 0
+            counts[cell] = done
+            cell_units = units_of[cell]
+            for unit in cell_units:
+                places[unit * size + value] = done
+            # Остальные кандидаты клетки теряют в ее блоках по месту
+            mask ^= bit
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                other = low.bit_length() - 1
+                for unit in cell_units:
+                    index = unit * size + other
+                    left = places[index]
+                    if left != done:
+                        if left == 1:
+                            return False
+                        places[index] = left - 1
+                        if left == 2:
+                            hidden.append(index)
+            for peer in peers[cell]:
+                mask = cand[peer]
+                if mask & bit:
+                    mask ^= bit
+                    cand[peer] = mask
+                    counts[peer] -= 1
+                    if not mask:
+                        return False
+                    if not mask & (mask - 1):
+                        stack.append((peer, mask.bit_length() - 1))
+                    # В общих с cell блоках value уже стоит, остальные теряют место
+                    for unit in units_of[peer]:
+                        index = unit * size + value
+                        left = places[index]
+                        if left != done:
+                            if left == 1:
+                                return False
+                            places[index] = left - 1
+                            if left == 2:
+                                hidden.append(index)
+        return True
+
+
+def parse(puzzle: str, alphabet: str = None) -> Board:
+    """ Строка из N * N символов алфавита и '.'; None, если в ней есть противоречие """
+    size = math.isqrt(len(puzzle))
+    alphabet = alphabet or ALPHABETS[size]
+    board = Board(geometry(size))
+    for cell, ch in enumerate(puzzle):
+        if ch != EMPTY and not board.assign(cell, alphabet.index(ch)):
+            return None
+    return board
+
+
+def search(board: Board, rng: random.Random = None, budget: list = None):
+    """
+    Все решения. Одиночки расставляет `Board.assign`, а ветвление идет по
+    самому ограниченному выбору по счетчикам доски: либо по клетке с
+    наименьшим числом кандидатов, либо по цифре, у которой в каком-то блоке
+    меньше всего мест. С rng варианты перебираются в случайном порядке;
+    budget - список из одного числа, сколько еще узлов можно посетить.
+    """
+    if budget is not None:
+        if budget[0] <= 0:
+            return
+        budget[0] -= 1
+    geo = board.geo
+    cand, counts, places = board.cand, board.counts, board.places
+    fewest = min(counts)
+    if fewest == geo.done:
+        yield board
+        return
+    fewest_places = min(places)
+    if fewest_places < fewest:
+        unit, value = divmod(places.index(fewest_places), geo.size)
+        choices = [(cell, value) for cell in geo.units[unit] if cand[cell] >> value & 1]
+    else:
+        cell = counts.index(fewest)
+        choices = [(cell, value) for value in range(geo.size) if cand[cell] >> value & 1]
+    if rng is not None:
+        rng.shuffle(choices)
+    for cell, value in choices:
+        child = board.copy()
+        if child.assign(cell, value):
+            yield from search(child, rng, budget)
+
+
+def solve_string(puzzle: str, alphabet: str = None) -> str:
+    """ Решить головоломку любого размера; None, если решения нет
+    >>> solve_string('1.3.3..2.1.34..1')
+    '1234341221434321'
+    >>> solve_string('53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79')
+    '534678912672195348198342567859761423426853791713924856961537284287419635345286179'
+    """
+    board = parse(puzzle, alphabet)
+    if board is None:
+        return None
+    solved = solve_board(board)
+    if solved is None:
+        return None
+    alphabet = alphabet or ALPHABETS[board.geo.size]
+    return ''.join(alphabet[v] for v in solved.values)
+
+
+def solve_board(board: Board, first_budget: int = 200, max_budget: int = None) -> Board:
+    """
+    Время поиска на больших полях имеет тяжелый хвост: неудачный выбор в
+    начале перебора стоит очень дорого. Поэтому поиск перезапускается со
+    случайным порядком ветвления и удваивающимся лимитом узлов. Если поиск
+    уложился в лимит и ничего не нашел, решения нет. max_budget ограничивает
+    лимит попытки: когда он исчерпан, возвращается None, хотя решение может
+    и быть.
+    """
+    budget = first_budget
+    for attempt in itertools.count():
+        remaining = [budget]
+        solved = next(search(board.copy(), random.Random(attempt), remaining), None)
+        if solved is not None or remaining[0] > 0:
+            return solved
+        if max_budget is not None and budget >= max_budget:
+            return None
+        budget *= 2
+
+
+def read_puzzle(filename: str, alphabet: str = None) -> str:
+    """ Прочитать головоломку любого размера; пробелы и переводы строк игнорируются,
+    размер определяется по числу клеток
+    >>> len(read_puzzle('puzzle1.txt'))
+    81
+    """
+    with open(filename) as f:
+        text = ''.join(f.read().split())
+    if alphabet is None:
+        alphabet = ALPHABETS[math.isqrt(len(text))]
+    return ''.join(ch for ch in text if ch == EMPTY or ch in alphabet)
+
+
+def display(puzzle: str) -> None:
+    """ Вывод головоломки любого размера """
+    geo = geometry(math.isqrt(len(puzzle)))
+    line = '+'.join(['-' * (2 * geo.n)] * geo.n)
+    for row in range(geo.size):
+        print(''.join(puzzle[row * geo.size + col].center(2) +
+                      ('|' if col % geo.n == geo.n - 1 and col != geo.size - 1 else '')
+                      for col in range(geo.size)))
+        if row % geo.n == geo.n - 1 and row != geo.size - 1:
+            print(line)
+    print()
+
+
+def random_puzzle(size: int, holes: float, rng: random.Random = random) -> str:
+    """ Случайная головоломка для нагрузочных тестов: решенное поле по шаблону,
+    перемешанное симметриями Судоку, из которого убрана доля holes клеток
+    (единственность решения не гарантируется)
+    >>> puzzle = random_puzzle(16, 0.5)
+    >>> len(puzzle), solve_string(puzzle) is not None
+    (256, True)
+    """
+    geo = geometry(size)
+    n = geo.n
+
+    def shuffled_lines() -> list:
+        bands = rng.sample(range(n), n)
+        return [band * n + line for band in bands for line in rng.sample(range(n), n)]
+
+    rows, cols = shuffled_lines(), shuffled_lines()
+    alphabet = ALPHABETS[size]
+    symbols = rng.sample(alphabet, size)
+    cells = [symbols[(n * (r % n) + r // n + c) % size] for r in rows for c in cols]
+    for cell in rng.sample(range(geo.cells), int(geo.cells * holes)):
+        cells[cell] = EMPTY
+    return ''.join(cells)
@@ -1,5 +1,10 @@
 import random
 
+import bitmask
+import compact
+import dlx
+import generator
+
 
 def group(values: list, n: int) -> list:
     """
@@ -24,6 +29,8 @@ def read_sudoku(filename: str) -> list:
 
 def display(values: list):
     """Вывод Судоку """
+    if isinstance(values, compact.CompactGrid):
+        return values.display()
     width = 2
     line = '+'.join(['-' * (width * 3)] * 3)
     for row in range(9):
@@ -112,8 +119,29 @@ def find_possible_values(grid: list, pos: tuple) -> set:
     return new
 
 
-def solve(grid: list) -> list:
+def solve(grid: list, backend: str = 'bitmask') -> list:
     """ Решение пазла, заданного в grid
+
+    Решение записывается в grid. Если решения нет, возвращается пустой список.
+    backend - один из BACKENDS: 'bitmask' (битовые маски, bitmask.py),
+    'dlx' (точное покрытие, dlx.py), 'compact' (поле в массиве байтов,
+    compact.py) или 'backtracking' (простой перебор).
+    >>> grid = read_sudoku('puzzle1.txt')
+    >>> solve(grid)
+    [['5', '3', '4', '6', '7', '8', '9', '1', '2'], ['6', '7', '2', '1', '9', '5', '3', '4', '8'], ['1', '9', '8', '3', '4', '2', '5', '6', '7'], ['8', '5', '9', '7', '6', '1', '4', '2', '3'], ['4', '2', '6', '8', '5', '3', '7', '9', '1'], ['7', '1', '3', '9', '2', '4', '8', '5', '6'], ['9', '6', '1', '5', '3', '7', '2', '8', '4'], ['2', '8', '7', '4', '1', '9', '6', '3', '5'], ['3', '4', '5', '2', '8', '6', '1', '7', '9']]
+    >>> solve(read_sudoku('puzzle2.txt'), 'dlx') == solve(read_sudoku('puzzle2.txt'))
+    True
+    """
+    solution = BACKENDS[backend](''.join(''.join(row) for row in grid))
+    if solution is None:
+        return []
+    for row in range(9):
+        grid[row][:] = solution[row * 9:row * 9 + 9]
+    return grid
+
+
+def solve_backtracking(grid: list) -> list:
+    """ Решение пазла, заданного в grid, простым перебором
     Как решать Судоку?
     1. Найти свободную позицию
     2. Найти все возможные значения, которые могут находиться на этой позиции
@@ -121,8 +149,8 @@ def solve(grid: list) -> list:
         3.1. Поместить это значение на эту позицию
         3.2. Продолжить решать оставшуюся часть пазла
     >>> grid = read_sudoku('puzzle1.txt')
-    >>> solve(grid)
-    [['5', '3', '4', '6', '7', '8', '9', '1', '2'], ['6', '7', '2', '1', '9', '5', '3', '4', '8'], ['1', '9', '8', '3', '4', '2', '5', '6', '7'], ['8', '5', '9', '7', '6', '1', '4', '2', '3'], ['4', '2', '6', '8', '5', '3', '7', '9', '1'], ['7', '1', '3', '9', '2', '4', '8', '5', '6'], ['9', '6', '1', '5', '3', '7', '2', '8', '4'], ['2', '8', '7', '4', '1', '9', '6', '3', '5'], ['3', '4', '5', '2', '8', '6', '1', '7', '9']]
+    >>> solve_backtracking(grid) == solve(read_sudoku('puzzle1.txt'))
+    True
     """
     pos = find_empty_positions(grid)
     if pos == (-1, -1):
@@ -130,7 +158,7 @@ def solve(grid: list) -> list:
     row, col = pos
     for new in find_possible_values(grid, pos):
         grid[row][col] = new
-        solved_sud = solve(grid)
+        solved_sud = solve_backtracking(grid)
         if solved_sud:
             return solved_sud
         else:
@@ -139,8 +167,26 @@ def solve(grid: list) -> list:
     return []
 
 
+def solve_backtracking_string(puzzle: str) -> str:
+    """ Перебор для строки из 81 символа, как у остальных решателей """
+    solution = solve_backtracking(group(list(puzzle), 9))
+    if not solution:
+        return None
+    return ''.join(''.join(row) for row in solution)
+
+
+BACKENDS = {
+    'bitmask': bitmask.solve_string,
+    'dlx': dlx.solve_string,
+    'backtracking': solve_backtracking_string,
+    'compact': compact.solve_string,
+}
+
+
 def check_solution(solution: list) -> bool:
     """ Если решение solution верно, то вернуть True, в противном случае False """
+    if isinstance(solution, compact.CompactGrid):
+        return solution.is_solved()
     for row in range(len(solution)):
         if set(get_row(solution, (row, 0))) != set('123456789'):
             return False
@@ -159,6 +205,9 @@ def check_solution(solution: list) -> bool:
 
 def generate_sudoku(N: int) -> list:
     """ Генерация судоку заполненного на N элементов
+
+    Единственность решения не проверяется; головоломки с единственным
+    решением и оценкой сложности строит generator.generate_graded
     >>> grid = generate_sudoku(40)
     >>> sum(1 for row in grid for e in row if e == '.')
     41
@@ -178,7 +227,7 @@ def generate_sudoku(N: int) -> list:
     >>> check_solution(solution)
     True
     """
-    grid = solve([['.'] * 9 for _ in range(9)])
+    grid = group(list(generator.random_solution()), 9)
     N = 81 - min(81, max(0, N))
     while N:
         row = random.randint(0, 8)
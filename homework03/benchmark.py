@@ -0,0 +1,74 @@
+import os
+import time
+
+import patterns
+from engines import ENGINES
+from hashlife import HashLifeGameOfLife
+from life_sparse import SparseGameOfLife, parse_pattern
+from life_tiled import TiledGameOfLife
+
+# Размеры полей для каждой реализации: на больших полях списковая
+# реализация делает шаг несколько секунд
+SIZES = {
+    'list': (100,),
+    'numpy': (100, 1000, 2000),
+    'bits': (100, 1000, 2000, 10000),
+    # Случайное поле с половиной живых клеток - худший случай для разреженной реализации
+    'sparse': (100, 1000),
+}
+
+
+def time_steps(life, steps: int) -> float:
+    """ Среднее время шага в миллисекундах """
+    start = time.perf_counter()
+    for _ in range(steps):
+        life.step()
+    return (time.perf_counter() - start) / steps * 1000
+
+
+def bench_engines(steps: int = 10) -> None:
+    print(f'{"engine":<10}{"size":>12}{"ms/step":>12}{"Mcells/s":>12}')
+    for name, sizes in SIZES.items():
+        for side in sizes:
+            life = ENGINES[name]((side, side))
+            ms = time_steps(life, steps)
+            print(f'{name:<10}{f"{side}x{side}":>12}{ms:12.2f}{side * side / ms / 1000:12.1f}')
+
+
+def bench_hashlife() -> None:
+    """ Время, за которое узор доходит до 2**k поколения: HashLife одним шагом
+    в 2**k поколений против разреженной реализации по одному поколению """
+    print(f'{"pattern":<20}{"generations":>14}{"hashlife, s":>14}{"sparse, s":>12}{"population":>14}')
+    for name in ('GOSPER_GLIDER_GUN', 'ACORN', 'R_PENTOMINO'):
+        cells = parse_pattern(getattr(patterns, name))
+        for k in (10, 16, 24, 32):
+            game = HashLifeGameOfLife(step_log=k)
+            game.curr_generation = cells
+            start = time.perf_counter()
+            game.step()
+            hashlife_time = time.perf_counter() - start
+            sparse_time = ''
+            if k == 10:
+                sparse = SparseGameOfLife()
+                sparse.curr_generation = cells
+                sparse_time = f'{time_steps(sparse, 2 ** k) * 2 ** k / 1000:.3f}'
+            print(f'{name:<20}{f"2^{k}":>14}{hashlife_time:14.3f}{sparse_time:>12}{game.population:>14}')
+
+
+def bench_tiled(side: int = 8000, steps: int = 10) -> None:
+    """ Сильная масштабируемость: одно и то же поле на 1..N процессах """
+    print(f'{"workers":<10}{"ms/step":>12}{"speedup":>12}')
+    base = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        with TiledGameOfLife((side, side), workers=workers) as life:
+            # Первый шаг запускает процессы и в замер не входит
+            life.step()
+            ms = time_steps(life, steps)
+        base = base or ms
+        print(f'{workers:<10}{ms:12.1f}{base / ms:12.2f}')
+
+
+if __name__ == '__main__':
+    bench_engines()
+    bench_hashlife()
+    bench_tiled()
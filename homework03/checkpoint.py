@@ -0,0 +1,253 @@
+""" Периодическое сохранение состояния игры (контрольные точки) и продолжение с него """
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+import engines
+from formats import WORD, pack, unpack
+from life import GameOfLife
+from life_sparse import set_stats
+
+# Файл контрольной точки: заголовок (сигнатура, реализация, rows, cols,
+# generations, область), затем текущее и предыдущее поколения внутри
+# области в упакованном виде, как в формате .bin (см. `formats`). Область
+# (top, left, height, width) - это поле rows x cols, а на бесконечном поле
+# (HashLife, SparseGameOfLife без size) - прямоугольник вокруг живых клеток,
+# который может выходить за поле и иметь отрицательные координаты; rows и
+# cols в этом случае нулевые. Заголовок кратен 8 байтам, поэтому поколения
+# можно отобразить в память.
+MAGIC = b'LIFECKP2'
+HEADER = struct.Struct('<8s8sQQQqqQQ')
+# Наибольшая область бесконечного поля в клетках (128 МБ на поколение в
+# упакованном виде); разбежавшийся узор HashLife за миллионы поколений
+# занимает прямоугольник, который не поместился бы в память
+MAX_AREA = 1 << 30
+
+
+def _area(life: GameOfLife, cells: frozenset) -> tuple:
+    """ (top, left, height, width): поле вместе с живыми клетками вне его """
+    box = set_stats(frozenset(), cells).bounding_box
+    if box is None:
+        return 0, 0, life.rows, life.cols
+    top, left, bottom, right = box
+    if life.rows and life.cols:
+        top, left = min(top, 0), min(left, 0)
+        bottom, right = max(bottom, life.rows - 1), max(right, life.cols - 1)
+    return top, left, bottom - top + 1, right - left + 1
+
+
+def capture(life: GameOfLife) -> tuple:
+    """
+    Снимок игры: (реализация, rows, cols, generations, область, curr, prev),
+    область - (top, left, height, width). Поля только копируются, а
+    упаковываются потом, при записи, поэтому снимок занимает у цикла шагов
+    не больше времени, чем копирование. Если область бесконечного поля
+    больше MAX_AREA клеток, поднимается ValueError.
+    """
+    name = next((name for name, cls in engines.ENGINES.items() if type(life) is cls), 'list')
+    boards = []
+    area = (0, 0, life.rows, life.cols)
+    for grid in (life.curr_generation, life.prev_generation):
+        if isinstance(grid, (set, frozenset)):
+            boards.append(frozenset(grid))
+        else:
+            boards.append(np.array(grid, dtype=np.uint64 if getattr(grid, 'dtype', None) == np.uint64 else np.uint8))
+    if isinstance(boards[0], frozenset):
+        area = _area(life, boards[0] | boards[1])
+        if area[2] * area[3] > MAX_AREA:
+            raise ValueError(f'live area {area[2]}x{area[3]} is too large to checkpoint')
+    return (name, life.rows, life.cols, life.generations, area) + tuple(boards)
+
+
+def _packed(board, area: tuple) -> np.ndarray:
+    top, left, height, width = area
+    if isinstance(board, frozenset):
+        # Упаковываются сразу живые клетки, без плотной матрицы: она в 8 раз больше
+        packed = np.zeros((height, -(-width // WORD)), dtype=np.uint64)
+        cells = np.array(list(board), dtype=np.int64).reshape(-1, 2) - (top, left)
+        rows, cols = cells[:, 0], cells[:, 1]
+        np.bitwise_or.at(packed, (rows, cols // WORD), np.uint64(1) << (cols % WORD).astype(np.uint64))
+        return packed
+    if board.dtype == np.uint64:
+        return board
+    return pack(board, width)
+
+
+def write_checkpoint(filename: str, snapshot: tuple) -> None:
+    """
+    Записать снимок (см. `capture`). Файл сначала пишется рядом под
+    временным именем и затем подменяет старый, так что при падении
+    процесса на диске всегда остается целая контрольная точка.
+    """
+    name, rows, cols, generations, area, curr, prev = snapshot
+    curr, prev = _packed(curr, area), _packed(prev, area)
+    temp = filename + '.tmp'
+    with open(temp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, name.encode(), rows, cols, generations, *area))
+        np.ascontiguousarray(curr, dtype='<u8').tofile(f)
+        np.ascontiguousarray(prev, dtype='<u8').tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, filename)
+
+
+def read_checkpoint(filename: str) -> tuple:
+    """
+    Прочитать контрольную точку: (реализация, rows, cols, generations,
+    область, curr, prev), см. `capture`.
+    """
+    with open(filename, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size or not header.startswith(MAGIC):
+        raise ValueError(f'{filename} is not a Life checkpoint')
+    _, name, rows, cols, generations, *area = HEADER.unpack(header)
+    height, width = area[2:]
+    shape = (2, height, -(-width // WORD))
+    if not height or not width:
+        # Пустую область нельзя отобразить в память
+        boards = np.zeros(shape, dtype='<u8')
+    else:
+        boards = np.memmap(filename, dtype='<u8', mode='c', offset=HEADER.size, shape=shape)
+    return name.rstrip(b'\0').decode(), rows, cols, generations, tuple(area), boards[0], boards[1]
+
+
+def resume(filename: str, engine: str = None, max_generations: int = None) -> GameOfLife:
+    """
+    Продолжить игру с контрольной точки: восстанавливаются `generations`,
+    `curr_generation` и `prev_generation`. По умолчанию игра создается
+    с той же реализацией, с которой была сохранена. Бесконечное поле можно
+    продолжить в реализации с ограниченным полем, если живые клетки
+    помещаются в него с неотрицательными координатами.
+    """
+    name, rows, cols, generations, area, curr, prev = read_checkpoint(filename)
+    top, left, height, width = area
+    size = (rows, cols) if rows and cols else None
+    unbounded = (engines.SparseGameOfLife, engines.HashLifeGameOfLife)
+    if size is None and not issubclass(engines.ENGINES[engine or name], unbounded):
+        if top < 0 or left < 0:
+            raise ValueError('live cells of the checkpoint do not fit on the board')
+        size = (top + height, left + width)
+    life = engines.create(engine or name, size, randomize=False, max_generations=max_generations)
+    for attr, packed in (('prev_generation', prev), ('curr_generation', curr)):
+        grid = getattr(life, attr)
+        if isinstance(grid, (set, frozenset)):
+            cells = np.argwhere(unpack(packed, width))
+            setattr(life, attr, {(top + int(i), left + int(j)) for i, j in cells})
+        elif isinstance(grid, np.ndarray) and grid.dtype == np.uint64 and area == (0, 0, life.rows, life.cols):
+            setattr(life, attr, packed)
+        else:
+            board = _on_board(unpack(packed, width), area, (life.rows, life.cols))
+            setattr(life, attr, board.tolist() if isinstance(grid, list) else board)
+    life.generations = generations
+    return life
+
+
+def _on_board(grid: np.ndarray, area: tuple, size: tuple) -> np.ndarray:
+    """ Перенести клетки области на поле size; клетки вне поля - ошибка """
+    top, left = area[:2]
+    if (top, left) == (0, 0) and grid.shape == size:
+        return grid
+    board = np.zeros(size, dtype=np.uint8)
+    rows, cols = np.nonzero(grid)
+    rows, cols = rows + top, cols + left
+    if ((rows < 0) | (rows >= size[0]) | (cols < 0) | (cols >= size[1])).any():
+        raise ValueError('live cells of the checkpoint do not fit on the board')
+    board[rows, cols] = 1
+    return board
+
+
+class Checkpointer(threading.Thread):
+    """
+    Фоновый поток, записывающий контрольные точки в filename.
+
+    Цикл шагов вызывает `update(life)` после каждого шага; раз в every
+    поколений или раз в interval секунд (что наступит раньше) снимается
+    копия поля, а упаковка и запись идут в этом потоке. Если предыдущая
+    точка еще пишется, ожидающий снимок заменяется более новым, так что
+    цикл шагов никогда не ждет диск. Вызывать `update` нужно там же, где
+    делаются шаги (или под тем же замком, см. `Simulation`). Ошибка записи
+    сохраняется в `error` и поднимается в потоке шагов при следующем
+    снимке или при `stop`.
+    """
+
+    def __init__(self, filename: str, every: int = None, interval: float = None) -> None:
+        super().__init__(daemon=True)
+        self.filename = filename
+        self.every = every
+        self.interval = interval
+        self.last_generation = None
+        self.last_time = time.monotonic()
+        # Сколько точек записано и последняя ошибка записи
+        self.written = 0
+        self.error = None
+        self._pending = None
+        self._writing = False
+        self._stopped = False
+        self._ready = threading.Condition()
+
+    def is_due(self, life: GameOfLife) -> bool:
+        if self.last_generation is None:
+            self.last_generation = life.generations
+        if self.every and life.generations - self.last_generation >= self.every:
+            return True
+        return bool(self.interval) and time.monotonic() - self.last_time >= self.interval
+
+    def update(self, life: GameOfLife) -> bool:
+        """ Снять контрольную точку, если пора; True, если снята """
+        if not self.is_due(life):
+            return False
+        self.save(life)
+        return True
+
+    def save(self, life: GameOfLife) -> None:
+        """ Снять контрольную точку сейчас; запись пойдет в фоне """
+        self._raise_error()
+        snapshot = capture(life)
+        self.last_generation, self.last_time = life.generations, time.monotonic()
+        with self._ready:
+            self._pending = snapshot
+            self._ready.notify_all()
+
+    def run(self) -> None:
+        while True:
+            with self._ready:
+                while self._pending is None and not self._stopped:
+                    self._ready.wait()
+                if self._pending is None:
+                    return
+                snapshot, self._pending = self._pending, None
+                self._writing = True
+            try:
+                write_checkpoint(self.filename, snapshot)
+                self.written += 1
+            except Exception as error:
+                # Например, MemoryError: поток должен жить дальше, а ошибку
+                # увидит поток шагов
+                self.error = error
+            finally:
+                with self._ready:
+                    self._writing = False
+                    self._ready.notify_all()
+
+    def flush(self) -> None:
+        """ Дождаться записи всех снятых точек (поток должен быть запущен) """
+        with self._ready:
+            while self._pending is not None or self._writing:
+                self._ready.wait()
+        self._raise_error()
+
+    def stop(self) -> None:
+        """ Записать оставшуюся точку и остановить поток """
+        with self._ready:
+            self._stopped = True
+            self._ready.notify_all()
+        self.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
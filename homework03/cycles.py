@@ -0,0 +1,90 @@
+import collections
+import hashlib
+import itertools
+
+from life import GameOfLife
+
+
+def board_hash(grid) -> int:
+    """
+    64-битный хеш поколения любой реализации: массивы и списки хешируются
+    по байтам клеток, множества живых клеток - без учета порядка. NumPy
+    для этого не нужен: массив узнается по методу tobytes.
+
+    >>> import numpy as np
+    >>> board_hash([[0, 1], [1, 0]]) == board_hash(np.array([[0, 1], [1, 0]], dtype=np.uint8))
+    True
+    >>> board_hash({(0, 1), (1, 0)}) == board_hash({(1, 0), (0, 1)})
+    True
+    """
+    if isinstance(grid, (set, frozenset)):
+        return hash(frozenset(grid))
+    if hasattr(grid, 'tobytes'):
+        # tobytes всегда отдает байты в порядке строк, даже для срезов
+        data = grid.tobytes()
+    else:
+        data = bytes(itertools.chain.from_iterable(grid))
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+class CycleDetector:
+    """
+    Поиск циклов по хешам последних depth поколений.
+
+    После каждого шага `update` ищет хеш текущего поколения в словаре за O(1).
+    Если такое поколение уже было, найден цикл: `start` - поколение, с которого
+    он начался, `period` - его длина. Циклы длиннее depth не обнаруживаются.
+    """
+
+    def __init__(self, depth: int = 64) -> None:
+        self.depth = depth
+        self.history = collections.deque()
+        self.seen = {}
+        self.period = None
+        self.start = None
+
+    @property
+    def found(self) -> bool:
+        return self.period is not None
+
+    def reset(self) -> None:
+        self.history.clear()
+        self.seen.clear()
+        self.period = self.start = None
+
+    def update(self, life: GameOfLife) -> bool:
+        """ Учесть текущее поколение; True, если оно замыкает цикл """
+        key = board_hash(life.curr_generation)
+        generation = life.generations
+        first = self.seen.get(key)
+        if first is not None:
+            self.start, self.period = first, generation - first
+            return True
+        self.seen[key] = generation
+        self.history.append((key, generation))
+        if len(self.history) > self.depth:
+            old_key, old_generation = self.history.popleft()
+            if self.seen.get(old_key) == old_generation:
+                del self.seen[old_key]
+        return False
+
+    def fast_forward(self, life: GameOfLife, generation: int) -> None:
+        """
+        Перейти к поколению generation, не проходя цикл целиком: состояние
+        повторяется с периодом period, так что достаточно меньше period шагов.
+        Шаг может продвигать игру больше чем на одно поколение (HashLife),
+        поэтому пройденные поколения считаются по `generations`; если такими
+        шагами в нужное поколение цикла не попасть, поднимается ValueError.
+        """
+        if not self.found:
+            raise ValueError('Cycle is not detected yet')
+        remaining = (generation - life.generations) % self.period
+        for _ in range(self.period):
+            if not remaining:
+                break
+            before = life.generations
+            life.step()
+            remaining = (remaining - (life.generations - before)) % self.period
+        if remaining:
+            raise ValueError(f'generation {generation} is not reachable with steps of this game')
+        life.generations = generation
@@ -0,0 +1,23 @@
+""" Реализации Игры "Жизнь" с одинаковым интерфейсом (step, curr_generation,
+prev_generation, is_changing, generations) """
+from hashlife import HashLifeGameOfLife
+from life import GameOfLife
+from life_bits import BitGameOfLife
+from life_numpy import NumpyGameOfLife
+from life_sparse import SparseGameOfLife
+from life_tiled import TiledGameOfLife
+
+ENGINES = {
+    'list': GameOfLife,
+    'numpy': NumpyGameOfLife,
+    'bits': BitGameOfLife,
+    'sparse': SparseGameOfLife,
+    'hashlife': HashLifeGameOfLife,
+    'tiled': TiledGameOfLife,
+}
+
+
+def create(engine: str, size: tuple, randomize: bool = True,
+           max_generations: int = None) -> GameOfLife:
+    """ Создать игру с реализацией engine """
+    return ENGINES[engine](size, randomize=randomize, max_generations=max_generations)
@@ -0,0 +1,188 @@
+""" Форматы файлов с полем: текст из 0 и 1, plaintext (.cells), RLE (.rle)
+и упакованный двоичный формат (.bin), который можно отображать в память """
+import os
+import re
+import struct
+
+import numpy as np
+
+# Двоичный формат: заголовок (сигнатура, rows, cols), затем строки поля по
+# 64 клетки в слове uint64 little-endian, клетка col - бит col % 64 слова
+# col // 64 (см. `pack`), как в life_bits. Заголовок кратен 8 байтам, поэтому слова
+# выровнены и файл отображается в память без копирования.
+MAGIC = b'LIFEBIT1'
+HEADER = struct.Struct('<8sQQ')
+WORD = 64
+
+RLE_TOKEN = re.compile(r'(\d*)([a-zA-Z$!])')
+RLE_LINE_WIDTH = 70
+
+
+def read_text(text: str) -> np.ndarray:
+    """
+    Поле из строк нулей и единиц, как в grid.txt.
+
+    >>> read_text('110\\n011\\n').tolist()
+    [[1, 1, 0], [0, 1, 1]]
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return np.array([[int(ch) for ch in line] for line in lines], dtype=np.uint8).reshape(len(lines), -1)
+
+
+def write_text(grid: np.ndarray) -> str:
+    return ''.join(''.join('01'[value] for value in row) + '\n' for row in grid.tolist())
+
+
+def read_plaintext(text: str) -> np.ndarray:
+    """
+    Формат plaintext: строки с '!' - комментарии, 'O' - живая клетка,
+    '.' - мертвая; короткие строки дополняются мертвыми клетками.
+
+    >>> read_plaintext('!Name: Glider\\n.O\\n..O\\nOOO\\n').tolist()
+    [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+    """
+    lines = [line.rstrip() for line in text.splitlines() if not line.startswith('!')]
+    while lines and not lines[-1]:
+        lines.pop()
+    grid = np.zeros((len(lines), max(map(len, lines), default=0)), dtype=np.uint8)
+    for row, line in enumerate(lines):
+        grid[row, :len(line)] = [ch in 'O*' for ch in line]
+    return grid
+
+
+def write_plaintext(grid: np.ndarray, name: str = None) -> str:
+    header = f'!Name: {name}\n' if name else ''
+    return header + ''.join(''.join('.O'[value] for value in row) + '\n' for row in grid.tolist())
+
+
+def read_rle(text: str) -> np.ndarray:
+    """
+    Формат RLE: строка "x = ширина, y = высота", затем серии вида
+    <число><тег>, где 'b' - мертвые клетки, 'o' (и другие буквы) - живые,
+    '$' - конец строки, '!' - конец узора.
+
+    >>> read_rle('#N Glider\\nx = 3, y = 3, rule = B3/S23\\nbo$2bo$3o!').tolist()
+    [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+    """
+    lines = [line for line in text.splitlines() if not line.startswith('#')]
+    header = dict(item.split('=') for item in lines[0].replace(' ', '').split(',') if '=' in item)
+    grid = np.zeros((int(header['y']), int(header['x'])), dtype=np.uint8)
+    row = col = 0
+    for count, tag in RLE_TOKEN.findall(''.join(lines[1:])):
+        count = int(count or 1)
+        if tag == '!':
+            break
+        if tag == '$':
+            row, col = row + count, 0
+        else:
+            if tag != 'b':
+                grid[row, col:col + count] = 1
+            col += count
+    return grid
+
+
+def write_rle(grid: np.ndarray) -> str:
+    """
+    Записать поле в RLE; мертвые клетки в конце строк и пустые строки в
+    конце поля не пишутся.
+
+    >>> write_rle(read_rle('x = 3, y = 3\\nbo$2bo$3o!'))
+    'x = 3, y = 3, rule = B3/S23\\nbo$2bo$3o!\\n'
+    """
+    rows, cols = grid.shape
+    tokens = []
+    pending_rows = 0
+    for line in grid:
+        # Границы серий одинаковых клеток
+        changes = np.flatnonzero(np.diff(line)) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [cols]))
+        runs = [(int(end - start), 'o' if line[start] else 'b') for start, end in zip(starts, ends)]
+        if runs and runs[-1][1] == 'b':
+            runs.pop()
+        if not runs:
+            pending_rows += 1
+            continue
+        if tokens or pending_rows:
+            tokens.append((pending_rows + 1 if tokens else pending_rows, '$'))
+        pending_rows = 0
+        tokens.extend(runs)
+    tokens.append((1, '!'))
+
+    body, line = [], ''
+    for count, tag in tokens:
+        if not count:
+            continue
+        token = (str(count) if count > 1 else '') + tag
+        if len(line) + len(token) > RLE_LINE_WIDTH:
+            body.append(line)
+            line = ''
+        line += token
+    body.append(line)
+    return f'x = {cols}, y = {rows}, rule = B3/S23\n' + '\n'.join(body) + '\n'
+
+
+def pack(grid, cols: int) -> np.ndarray:
+    """
+    Упаковать матрицу клеток по 64 клетки в слово: клетка (row, col)
+    хранится в бите col % 64 слова col // 64 строки row.
+    """
+    grid = np.asarray(grid, dtype=np.uint8)
+    words = -(-cols // WORD)
+    padded = np.zeros((grid.shape[0], words * WORD), dtype=np.uint8)
+    padded[:, :cols] = grid
+    packed = np.packbits(padded, axis=1, bitorder='little')
+    return packed.view('<u8').astype(np.uint64)
+
+
+def unpack(packed: np.ndarray, cols: int) -> np.ndarray:
+    """ Обратное к `pack`: матрица uint8 из упакованного поля """
+    as_bytes = np.ascontiguousarray(packed, dtype='<u8').view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, count=cols, bitorder='little')
+
+
+def save_packed(filename: str, packed: np.ndarray, cols: int) -> None:
+    """ Записать упакованное поле одной операцией записи, без построчной сборки """
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, packed.shape[0], cols))
+        np.ascontiguousarray(packed, dtype='<u8').tofile(f)
+
+
+def load_packed(filename: str, mode: str = 'r') -> tuple:
+    """
+    Отобразить упакованное поле в память; (слова uint64, число столбцов).
+    Данные читаются с диска только при обращении к ним, поэтому даже поле
+    в миллиарды клеток открывается мгновенно.
+    """
+    with open(filename, 'rb') as f:
+        magic, rows, cols = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f'{filename} is not a packed Life board')
+    words = -(-cols // WORD)
+    packed = np.memmap(filename, dtype='<u8', mode=mode, offset=HEADER.size, shape=(rows, words))
+    return packed, cols
+
+
+READERS = {'.rle': read_rle, '.cells': read_plaintext}
+WRITERS = {'.rle': write_rle, '.cells': write_plaintext}
+
+
+def load(filename: str) -> np.ndarray:
+    """ Прочитать поле; формат определяется по расширению (по умолчанию - 0 и 1) """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.bin':
+        packed, cols = load_packed(filename)
+        return unpack(packed, cols)
+    with open(filename) as f:
+        return READERS.get(ext, read_text)(f.read())
+
+
+def save(filename: str, grid: np.ndarray) -> None:
+    """ Записать поле; формат определяется по расширению (по умолчанию - 0 и 1) """
+    ext = os.path.splitext(filename)[1].lower()
+    grid = np.asarray(grid, dtype=np.uint8)
+    if ext == '.bin':
+        save_packed(filename, pack(grid, grid.shape[1]), grid.shape[1])
+        return
+    with open(filename, 'w') as f:
+        f.write(WRITERS.get(ext, write_text)(grid))
@@ -1,166 +1,23 @@
-import random
-import abc
+import contextlib
+
+import numpy as np
 import pygame
 from pygame.locals import *
-import copy
-from copy import deepcopy
-
-class GameOfLife:
-
-    def __init__(self, size: tuple, randomize: bool=True, max_generations: int=None) -> None:
-        # Размер клеточного поля
-        self.rows, self.cols = size
-        # Предыдущее поколение клеток
-        self.prev_generation = self.create_grid()
-        # Текущее поколение клеток
-        self.curr_generation = self.create_grid(randomize=randomize)
-        # Максимальное число поколений
-        self.max_generations = max_generations
-        # Текущее число поколений
-        self.generations = 1
-
-    def create_grid(self, randomize: bool = True) -> list:
-        """
-        Создание списка клеток.
-
-        Клетка считается живой, если ее значение равно 1, в противном случае клетка
-        считается мертвой, то есть, ее значение равно 0.
-
-        Parameters
-        ----------
-        randomize : bool
-            Если значение истина, то создается матрица, где каждая клетка может
-            быть равновероятно живой или мертвой, иначе все клетки создаются мертвыми.
-
-        Returns
-        ----------
-        out : Grid
-            Матрица клеток размером `cell_height` х `cell_width`.
-        """
-        grid = [[0] * self.rows for i in range(self.cols)]
-        if randomize:
-            for i in range(self.cols):
-                for j in range(self.rows):
-                    grid[i][j] = random.randint(0, 1)
-        return grid
-
-    def get_neighbours(self, cell: tuple) -> list:
-        """
-        Вернуть список соседних клеток для клетки `cell`.
-
-        Соседними считаются клетки по горизонтали, вертикали и диагоналям,
-        то есть, во всех направлениях.
-
-        Parameters
-        ----------
-        cell : Cell
-            Клетка, для которой необходимо получить список соседей. Клетка
-            представлена кортежем, содержащим ее координаты на игровом поле.
-
-        Returns
-        ----------
-        out : Cells
-            Список соседних клеток.
-        """
-        neighbours = []
-        x, y = cell
-        for i in range(3):
-            for j in range(3):
-                nbcols = y -1 + i
-                nbrows = x - 1 + j
-                if nbcols in range(0, self.cols) and nbrows in range(0, self.rows) and (nbrows != x or nbcols != y):
-                    neighbours.append(self.curr_generation[nbrows][nbcols])
-        return neighbours
-
-    def get_next_generation(self) -> list:
-        """
-        Получить следующее поколение клеток.
-
-        Returns
-        ----------
-        out : Grid
-            Новое поколение клеток.
-        """
-        a = deepcopy(self.curr_generation)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if sum(self.get_neighbours((i,j))) < 2 or sum(self.get_neighbours((i,j))) > 3:
-                    a[i][j] = 0
-                elif sum(self.get_neighbours((i,j))) == 3:
-                    a[i][j] = 1
-        self.curr_generation = a
-        return self.curr_generation
-
-
-    def step(self) -> None:
-        """
-        Выполнить один шаг игры.
-        """
-        self.prev_generation = deepcopy(self.curr_generation)
-        self.curr_generation = deepcopy(self.get_next_generation())
-        self.generations += 1
-
-    @property
-    def is_max_generations_exceeded(self) -> bool:
-        """
-        Не превысило ли текущее число поколений максимально допустимое.
-        """
-        count = 0
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if self.curr_generation[i][j] == 1:
-                    count += 1
-        if count > self.max_generations:
-            return True
-        else:
-            return False
-
-    @property
-    def is_changing(self) -> bool:
-        """
-        Изменилось ли состояние клеток с предыдущего шага.
-        """
-        if self.prev_generation != self.curr_generation:
-            return True
-        return False
-
 
-    @staticmethod
-    def from_file(filename) -> 'GameOfLife':
-        """
-        Прочитать состояние клеток из указанного файла.
-        """
-        file = open(filename)
-        grid = file.readlines()
-        for i in range(len(grid)):
-            grid[i] = list(map(int, grid[i][0:len(grid[i]) - 2]))
-        self.curr_generation = grid
-        life = GameOfLife((len(grid[0]),len(grid)))
-        file.close()
-        return life
-
-
-    def save(self, filename) -> None:
-        """
-        Сохранить текущее состояние клеток в указанный файл.
-        """
-        file = open(filename, 'w')
-        for i in range(len(self.curr_generation)):
-            file.write(str(self.curr_generation[i]) + "/n")
-        file.close()
+from cycles import CycleDetector
+from life import GameOfLife
+from simulation import Simulation
+from ui import UI
 
-
-class UI(abc.ABC):
-    def __init__(self, life: GameOfLife) -> None:
-        self.life = life
-
-    @abc.abstractmethod
-    def run(self) -> None:
-        pass
+# Цвета мертвой и живой клетки в порядке значений клетки
+PALETTE = np.array([pygame.Color('white')[:3], pygame.Color('green')[:3]], dtype=np.uint8)
+# Если изменилось больше этой доли клеток, дешевле обновить весь экран
+FULL_UPDATE_SHARE = 0.25
 
 
 class GUI(UI):
-    def __init__(self, life, cell_size=10, speed=10):
+    def __init__(self, life, cell_size=10, speed=10, blit=False, show_fps=True,
+                 steps_per_frame=1, turbo_steps=100, background=False, cycle_depth=64):
         self.width = 640
         self.height = 480
         self.cell_size = cell_size
@@ -176,51 +33,171 @@ class GUI(UI):
 
         self.is_pause = 0
 
+        # Отрисовка всего поля одним масштабированным блитом вместо прямоугольников
+        self.blit = blit
+        if not blit and not (self.cell_width and self.cell_height):
+            raise ValueError(f'board {life.rows}x{life.cols} does not fit in a {self.width}x{self.height} '
+                             'window cell by cell; use blit=True')
+        # Размер поля на экране: если клетка меньше пикселя, поле сжимается до окна
+        self.board_size = life.cols * self.cell_width or self.width, life.rows * self.cell_height or self.height
+        # На клетках меньше 2 пикселей сетка закрыла бы все поле
+        self.grid_lines = self.cell_width >= 2 and self.cell_height >= 2
+        self.show_fps = show_fps
+        # Что сейчас нарисовано на экране; 2 - клетка не нарисована
+        self.shown = None
+        self.overlay_rect = None
+        self.lines = None
+
+        # Сколько поколений считается между кадрами; в турбо-режиме кадр
+        # рисуется раз в turbo_steps поколений, а частота кадров не ограничена
+        self.steps_per_frame = steps_per_frame
+        self.turbo_steps = turbo_steps
+        self.turbo = False
+        # Считать поколения в отдельном потоке, а рисовать с частотой speed
+        self.background = background
+        self.lock = contextlib.nullcontext()
+        # Остановка на циклах длиной до cycle_depth поколений (None - не искать)
+        self.cycles = CycleDetector(cycle_depth) if cycle_depth else None
+
         super().__init__(life)
 
-    def draw_lines(self) -> None:
+    def draw_lines(self, surface=None) -> None:
+        if not self.grid_lines:
+            return
+        surface = surface or self.screen
         for x in range(0, self.width, self.cell_width):
             pygame.draw.line(
-                self.screen,
+                surface,
                 pygame.Color('black'),
                 (x, 0),
                 (x, self.height)
             )
         for y in range(0, self.height, self.cell_height):
             pygame.draw.line(
-                self.screen,
+                surface,
                 pygame.Color('black'),
                 (0, y),
                 (self.width, y)
             )
 
-    def draw_grid(self) -> None:
-        for line_ind in range(len(life.curr_generation)):
-            for cell_ind in range(len(life.curr_generation[line_ind])):
-                pygame.draw.rect(
-                    self.screen,
-                    pygame.Color('green') if (
-                                life.curr_generation[line_ind][cell_ind]
-                                            )
-                    else pygame.Color('white'),
-                    (
-                        cell_ind * self.cell_width,
-                        line_ind * self.cell_height,
-                        self.cell_width,
-                        self.cell_height
-                    )
-                )
-
-        self.draw_lines()
+    def cell_rect(self, row: int, col: int) -> pygame.Rect:
+        """ Прямоугольник клетки без линий сетки """
+        gap = int(self.grid_lines)
+        return pygame.Rect(col * self.cell_width + gap, row * self.cell_height + gap,
+                           self.cell_width - gap, self.cell_height - gap)
+
+    def cell_at(self, pos: tuple) -> tuple:
+        """ Клетка (row, col) под точкой экрана или None, если точка вне поля """
+        (x, y), (width, height) = pos, self.board_size
+        if x >= width or y >= height:
+            return None
+        return y * self.life.rows // height, x * self.life.cols // width
+
+    def invalidate(self, rect: pygame.Rect) -> None:
+        """ Пометить клетки под прямоугольником как ненарисованные """
+        top, left = rect.top // self.cell_height, rect.left // self.cell_width
+        bottom, right = rect.bottom // self.cell_height + 1, rect.right // self.cell_width + 1
+        self.shown[top:bottom, left:right] = 2
+
+    def draw_grid(self) -> list:
+        """
+        Перерисовать только клетки, изменившиеся с прошлого кадра.
+
+        Возвращает список прямоугольников экрана, которые нужно обновить;
+        None означает, что обновить нужно весь экран.
+        """
+        cells = self.life.to_array()
+        if self.shown is None or self.shown.shape != cells.shape:
+            self.screen.fill(pygame.Color('white'))
+            self.draw_lines()
+            self.shown = np.full(cells.shape, 2, dtype=np.uint8)
+            self.overlay_rect = None
+        if self.blit:
+            self.blit_grid(cells)
+            self.shown = cells.copy()
+            return None
+        if self.overlay_rect is not None:
+            self.invalidate(self.overlay_rect)
+        changed = np.argwhere(cells != self.shown)
+        self.shown = cells.copy()
+        colors = [pygame.Color('white'), pygame.Color('green')]
+        rects = []
+        for row, col in changed:
+            rect = self.cell_rect(row, col)
+            self.screen.fill(colors[cells[row, col]], rect)
+            rects.append(rect)
+        if len(changed) > FULL_UPDATE_SHARE * cells.size:
+            return None
+        return rects
+
+    def blit_grid(self, cells: np.ndarray) -> None:
+        """
+        Нарисовать поле целиком: клетка - один пиксель маленькой поверхности,
+        которая растягивается до размера поля на экране (или сжимается, если
+        клеток больше, чем пикселей); поверх накладывается заранее
+        нарисованная сетка.
+        """
+        if self.lines is None and self.grid_lines:
+            self.lines = pygame.Surface(self.screen_size)
+            self.lines.fill(pygame.Color('white'))
+            self.lines.set_colorkey(pygame.Color('white'))
+            self.draw_lines(self.lines)
+        # surfarray индексирует поверхность как [x][y]
+        surface = pygame.surfarray.make_surface(PALETTE[cells.T])
+        self.screen.blit(pygame.transform.scale(surface, self.board_size), (0, 0))
+        if self.lines is not None:
+            self.screen.blit(self.lines, (0, 0))
+
+    def draw_overlay(self, font, clock) -> pygame.Rect:
+        """ Номер поколения, статистика и, если show_fps, частота кадров в углу экрана """
+        stats = self.life.stats
+        text = 'Поколение: ' + str(self.life.generations)
+        text += f'  Живых: {stats.population} (+{stats.births} -{stats.deaths})'
+        if self.show_fps:
+            text += f'  FPS: {clock.get_fps():.0f}'
+        if self.turbo:
+            text += '  turbo'
+        if self.cycles is not None and self.cycles.found:
+            text += f'  Цикл: период {self.cycles.period} с поколения {self.cycles.start}'
+        label = font.render(text, False, (0, 0, 0))
+        rect = self.screen.blit(label, (0, 0))
+        # Под надписью на следующем кадре нужно перерисовать клетки
+        self.overlay_rect = rect if self.overlay_rect is None else rect.union(self.overlay_rect)
+        return self.overlay_rect
+
+    def advance(self) -> bool:
+        """ Сделать шаги, положенные на один кадр; False, если игра закончилась """
+        life = self.life
+        steps = self.turbo_steps if self.turbo else self.steps_per_frame
+        for _ in range(steps):
+            if life.is_max_generations_exceeded:
+                return False
+            if not life.is_changing or (self.cycles is not None and self.cycles.found):
+                break
+            life.step()
+            if self.cycles is not None:
+                self.cycles.update(life)
+        return True
+
+    def restart_cycles(self) -> None:
+        """ После правки поля старая история поколений не нужна """
+        if self.cycles is not None:
+            self.cycles.reset()
+            self.cycles.update(self.life)
 
     def run(self) -> None:
         pygame.init()
         clock = pygame.time.Clock()
         pygame.display.set_caption('Game of Life')
-        self.screen.fill(pygame.Color('white'))
         myfont = pygame.font.SysFont('Comic Sans MS', 30)
         running = True
-        self.draw_grid()
+        life = self.life
+        simulation = None
+        self.restart_cycles()
+        if self.background:
+            simulation = Simulation(life, cycles=self.cycles)
+            self.lock = simulation.lock
+            simulation.start()
 
         while running:
             for event in pygame.event.get():
@@ -229,35 +206,47 @@ class GUI(UI):
                 elif event.type == KEYDOWN:
                     if event.key == pygame.K_SPACE:
                         self.is_pause = 1 - self.is_pause
+                        if simulation:
+                            simulation.pause() if self.is_pause else simulation.resume()
 
                     elif event.key == pygame.K_RIGHT:
                         if self.is_pause:
-                            life.step()
+                            with self.lock:
+                                life.step()
+                                if self.cycles is not None:
+                                    self.cycles.update(life)
 
-                elif event.type == pygame.MOUSEBUTTONUP:
-                    pos = pygame.mouse.get_pos()
+                    elif event.key == pygame.K_t:
+                        self.turbo = not self.turbo
 
-                    row = pos[1] // self.cell_height
-                    col = pos[0] // self.cell_width
-
-                    life.curr_generation[row][col] = (
-                            1 - life.curr_generation[row][col]
-                    )
-            if life.is_max_generations_exceeded:
+                elif event.type == pygame.MOUSEBUTTONUP:
+                    cell = self.cell_at(pygame.mouse.get_pos())
+                    if cell is None:
+                        continue
+
+                    with self.lock:
+                        life.toggle(cell)
+                        self.restart_cycles()
+                    if simulation and not self.is_pause:
+                        simulation.resume()
+
+            if simulation:
+                with self.lock:
+                    if life.is_max_generations_exceeded:
+                        running = False
+            elif not self.is_pause and not self.advance():
                 running = False
 
-            if not self.is_pause and life.is_changing:
-                life.step()
-
-            self.draw_grid()
-            generation = myfont.render(
-                'Поколение: ' + str(life.generations),
-                False,
-                (0, 0, 0)
-            )
-            self.screen.blit(generation, (0, 0))
-            pygame.display.flip()
-            clock.tick(self.speed)
+            with self.lock:
+                rects = self.draw_grid()
+                overlay = self.draw_overlay(myfont, clock)
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects + [overlay])
+            clock.tick(0 if self.turbo and not simulation else self.speed)
+        if simulation:
+            simulation.stop()
         pygame.quit()
 
 if __name__ == '__main__':
@@ -273,4 +262,4 @@ if __name__ == '__main__':
         max_generations=max_generations
     )
     gui = GUI(life)
-    gui.run()
\ No newline at end of file
+    gui.run()
@@ -0,0 +1,268 @@
+import random
+
+import numpy as np
+
+from life import GameOfLife, Stats
+from life_sparse import cells_to_array, set_stats
+
+
+class Node:
+    """
+    Узел квадродерева: квадрат 2**level x 2**level из четырех узлов уровнем
+    ниже. Узлы канонические - равные квадраты представлены одним объектом,
+    поэтому сравнение и хеширование идут по ссылке.
+    """
+
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw, ne, sw, se, level: int, population: int) -> None:
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.level = level
+        self.population = population
+
+
+class HashLife:
+    """
+    Таблица канонических узлов и кеш результатов HashLife.
+
+    `successor(node, j)` возвращает центральный квадрат узла через 2**j
+    поколений; результаты запоминаются, поэтому повторяющиеся участки поля
+    считаются один раз. Когда узлов становится больше max_nodes, кеш
+    результатов очищается, а из таблицы удаляются узлы, недостижимые из
+    переданных корней.
+    """
+
+    def __init__(self, max_nodes: int = 1 << 20) -> None:
+        self.max_nodes = max_nodes
+        self.nodes = {}
+        self.results = {}
+        self.dead = Node(None, None, None, None, 0, 0)
+        self.alive = Node(None, None, None, None, 0, 1)
+        self.empties = [self.dead]
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        key = (nw, ne, sw, se)
+        node = self.nodes.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population)
+            self.nodes[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        while len(self.empties) <= level:
+            e = self.empties[-1]
+            self.empties.append(self.join(e, e, e, e))
+        return self.empties[level]
+
+    def centre(self, node: Node) -> Node:
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def expand(self, node: Node) -> Node:
+        """ Узел уровнем выше, в центре которого находится node """
+        e = self.empty(node.level - 1)
+        return self.join(self.join(e, e, e, node.nw), self.join(e, e, node.ne, e),
+                         self.join(e, node.sw, e, e), self.join(node.se, e, e, e))
+
+    def is_padded(self, node: Node) -> bool:
+        """ Все живые клетки лежат в центральном квадрате половинного размера """
+        inner = self.join(node.nw.se.se, node.ne.sw.sw, node.sw.ne.ne, node.se.nw.nw)
+        return inner.population == node.population
+
+    def life_4x4(self, node: Node) -> Node:
+        """ Центр 2x2 квадрата 4x4 через одно поколение """
+        cells = [[0] * 4 for _ in range(4)]
+        for i, quarter in enumerate((node.nw, node.ne, node.sw, node.se)):
+            top, left = i // 2 * 2, i % 2 * 2
+            for j, leaf in enumerate((quarter.nw, quarter.ne, quarter.sw, quarter.se)):
+                cells[top + j // 2][left + j % 2] = leaf.population
+        result = []
+        for row in (1, 2):
+            for col in (1, 2):
+                count = sum(cells[row + dr][col + dc] for dr in (-1, 0, 1) for dc in (-1, 0, 1)) - cells[row][col]
+                alive = count == 3 or (count == 2 and cells[row][col])
+                result.append(self.alive if alive else self.dead)
+        return self.join(*result)
+
+    def successor(self, node: Node, j: int) -> Node:
+        """
+        Центральный квадрат узла уровня k (вдвое меньшей стороны) через 2**j
+        поколений, j <= k - 2.
+        """
+        key = (node, j)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+        if node.population == 0:
+            result = node.nw
+        elif node.level == 2:
+            result = self.life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join = self.join
+            # Девять перекрывающихся квадратов уровня k - 1
+            parts = [
+                nw, join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+                join(nw.sw, nw.se, sw.nw, sw.ne), self.centre(node), join(ne.sw, ne.se, se.nw, se.ne),
+                sw, join(sw.ne, se.nw, sw.se, se.sw), se,
+            ]
+            if j == node.level - 2:
+                # Полная скорость: дважды по 2**(j - 1) поколений
+                parts = [self.successor(part, j - 1) for part in parts]
+                step = j - 1
+            else:
+                # Квадраты не продвигаются, все 2**j поколений считаются на втором шаге
+                parts = [self.centre(part) for part in parts]
+                step = j
+            a, b, c, d, e, f, g, h, i = parts
+            result = join(self.successor(join(a, b, d, e), step), self.successor(join(b, c, e, f), step),
+                          self.successor(join(d, e, g, h), step), self.successor(join(e, f, h, i), step))
+        self.results[key] = result
+        return result
+
+    def collect(self, *roots: Node) -> None:
+        """ Сборка мусора: оставить только узлы, достижимые из roots """
+        if len(self.nodes) <= self.max_nodes:
+            return
+        self.results.clear()
+        self.empties = [self.dead]
+        nodes = {}
+        stack = [root for root in roots if root is not None and root.level > 0]
+        while stack:
+            node = stack.pop()
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in nodes:
+                continue
+            nodes[key] = node
+            stack.extend(child for child in key if child.level > 0)
+        self.nodes = nodes
+
+    def from_cells(self, cells: set) -> tuple:
+        """ Квадродерево для множества клеток; (node, top, left) """
+        if not cells:
+            return self.empty(3), 0, 0
+        top = min(row for row, _ in cells)
+        left = min(col for _, col in cells)
+        span = max(max(row for row, _ in cells) - top, max(col for _, col in cells) - left) + 1
+        level = max(3, (span - 1).bit_length())
+        return self._build({(row - top, col - left) for row, col in cells}, level), top, left
+
+    def _build(self, cells: set, level: int) -> Node:
+        if not cells:
+            return self.empty(level)
+        if level == 0:
+            return self.alive
+        half = 1 << (level - 1)
+        quarters = [set(), set(), set(), set()]
+        for row, col in cells:
+            quarters[(row >= half) * 2 + (col >= half)].add((row % half, col % half))
+        return self.join(*(self._build(quarter, level - 1) for quarter in quarters))
+
+    def to_cells(self, node: Node, top: int = 0, left: int = 0) -> set:
+        """ Множество живых клеток узла с левым верхним углом в (top, left) """
+        cells = set()
+        stack = [(node, top, left)]
+        while stack:
+            node, top, left = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                cells.add((top, left))
+                continue
+            half = 1 << (node.level - 1)
+            stack.extend(((node.nw, top, left), (node.ne, top, left + half),
+                          (node.sw, top + half, left), (node.se, top + half, left + half)))
+        return cells
+
+
+class HashLifeGameOfLife(GameOfLife):
+    """
+    Игра "Жизнь" на бесконечном поле, считаемая алгоритмом HashLife.
+
+    Каждый `step` продвигает поле на 2**step_log поколений, и на столько же
+    растет `generations`. `curr_generation` и `prev_generation` - множества
+    координат живых клеток, как в `SparseGameOfLife`; они строятся из
+    квадродерева только при обращении. size задает лишь область случайного
+    начального поля.
+    """
+
+    def __init__(self, size: tuple = None, randomize: bool = True, max_generations: int = None,
+                 step_log: int = 0, max_nodes: int = 1 << 20) -> None:
+        self.universe = HashLife(max_nodes)
+        self.step_log = step_log
+        super().__init__(size or (0, 0), randomize=randomize and size is not None,
+                         max_generations=max_generations)
+
+    @property
+    def curr_generation(self) -> set:
+        return self.universe.to_cells(self.root, self.top, self.left)
+
+    @curr_generation.setter
+    def curr_generation(self, grid) -> None:
+        if not isinstance(grid, (set, frozenset)):
+            grid = {(i, j) for i, row in enumerate(grid) for j, value in enumerate(row) if value}
+        self.root, self.top, self.left = self.universe.from_cells(grid)
+
+    @property
+    def prev_generation(self) -> set:
+        return self.universe.to_cells(*self.prev_root)
+
+    @prev_generation.setter
+    def prev_generation(self, grid) -> None:
+        if not isinstance(grid, (set, frozenset)):
+            grid = {(i, j) for i, row in enumerate(grid) for j, value in enumerate(row) if value}
+        self.prev_root = self.universe.from_cells(grid)
+
+    def create_grid(self, randomize: bool = True) -> set:
+        if not randomize:
+            return set()
+        return {(i, j) for i in range(self.rows) for j in range(self.cols) if random.randint(0, 1)}
+
+    def toggle(self, cell: tuple) -> None:
+        self.curr_generation = self.curr_generation ^ {cell}
+
+    @property
+    def population(self) -> int:
+        return self.root.population
+
+    @property
+    def stats(self) -> Stats:
+        # Множества клеток строятся при каждом обращении, поэтому
+        # поколение узнается по корню дерева и его положению
+        key = (self.root, self.top, self.left, self.prev_root)
+        if self._stats is None or self._counted != key:
+            self._stats = set_stats(self.prev_generation, self.curr_generation)
+            self._counted = key
+        return self._stats
+
+    def to_array(self) -> np.ndarray:
+        """ Участок поля вокруг живых клеток """
+        return cells_to_array(self.curr_generation)
+
+    def advance(self, j: int) -> None:
+        """ Продвинуть поле на 2**j поколений """
+        universe = self.universe
+        root, top, left = self.root, self.top, self.left
+        # За 2**j поколений узор расширяется не больше чем на 2**j клеток
+        # в каждую сторону, поэтому вокруг него нужен запас
+        while root.level < j + 2 or not universe.is_padded(root):
+            half = 1 << (root.level - 1)
+            root, top, left = universe.expand(root), top - half, left - half
+        half = 1 << (root.level - 1)
+        root, top, left = universe.expand(root), top - half, left - half
+        quarter = 1 << (root.level - 2)
+        self.root, self.top, self.left = universe.successor(root, j), top + quarter, left + quarter
+
+    def get_next_generation(self) -> set:
+        self.advance(self.step_log)
+        return self.curr_generation
+
+    def step(self) -> None:
+        self.prev_root = (self.root, self.top, self.left)
+        self.advance(self.step_log)
+        self.generations += 1 << self.step_log
+        self.universe.collect(self.root, self.prev_root[0])
+
+    @property
+    def is_changing(self) -> bool:
+        return self.prev_generation != self.curr_generation
@@ -3,14 +3,22 @@ from pygame.locals import *
 import random
 import abc
 import time
-import copy
 import curses
 
+from cycles import CycleDetector
+from life import Stats
+
 class GameOfLife:
 
     def __init__(self, size, randomize=True, max_generations=False) -> None:
         # Размер клеточного поля
         self.rows, self.cols = size
+        # Сколько клеток изменилось на последнем шаге (None - неизвестно)
+        # и поколение, для которого это посчитано
+        self.changes = None
+        self._counted = None
+        # Статистика последнего поколения (см. life.Stats)
+        self._stats = None
         # Предыдущее поколение клеток
         self.prev_generation = self.cell_list()
         # Текущее поколение клеток
@@ -27,7 +35,7 @@ class GameOfLife:
         :return: Список клеток, представленный в виде матрицы
         """
         self.clist = [[random.randint(0, 1) if randomize else 0 for i in range(
-                                        self.rows)] for i in range(self.cols)]
+                                        self.cols)] for i in range(self.rows)]
         return self.clist
 
     def get_neighbours(self, cell):
@@ -51,14 +59,19 @@ class GameOfLife:
 
         return neighbours
 
-    def update_cell_list(self, cell_list):
+    def update_cell_list(self, cell_list, out=None):
         """ Выполнить один шаг игры.
         Обновление всех ячеек происходит одновременно. Функция возвращает
         новое игровое поле.
         :param cell_list: Игровое поле, представленное в виде матрицы
+        :param out: Поле, в которое записать результат (по умолчанию - новое)
         :return: Обновленное игровое поле
         """
-        new_clist = [[0 for i in range(self.cols)] for i in range(self.rows)]
+        if out is None:
+            out = [[0 for i in range(self.cols)] for i in range(self.rows)]
+        new_clist = out
+        births = deaths = population = 0
+        live_rows, live_cols = [], []
 
         for row in range(self.rows):
             for col in range(self.cols):
@@ -75,19 +88,52 @@ class GameOfLife:
                     new_clist[row][col] = 1
                 elif cell_list[row][col] == 0 and neighbours_count == 3:
                     new_clist[row][col] = 1
-
+                    births += 1
+                else:
+                    if cell_list[row][col]:
+                        deaths += 1
+                    new_clist[row][col] = 0
+                if new_clist[row][col]:
+                    population += 1
+                    live_rows.append(row)
+                    live_cols.append(col)
+
+        self.changes, self._counted = births + deaths, new_clist
+        box = (min(live_rows), min(live_cols), max(live_rows), max(live_cols)) if live_rows else None
+        self._stats = Stats(births, deaths, population, box)
         self.clist = new_clist
         return self.clist
 
     def step(self) -> None:
         """
         Выполнить один шаг игры.
+        Новое поколение записывается на место предыдущего, и поля меняются
+        местами, так что копий поля не создается.
         """
-        self.prev_generation = copy.deepcopy(self.curr_generation)
-        self.curr_generation = copy.deepcopy(self.update_cell_list(
-                                                    self.curr_generation))
+        self.prev_generation, self.curr_generation = (
+            self.curr_generation,
+            self.update_cell_list(self.curr_generation, out=self.prev_generation)
+        )
         self.generations += 1
 
+    @property
+    def stats(self) -> Stats:
+        """ Статистика текущего поколения; считается при обновлении поля, а
+        если поле заменили снаружи, пересчитывается один раз """
+        if self._stats is None or self._counted is not self.curr_generation:
+            curr, prev = self.curr_generation, self.prev_generation
+            cells = [(row, col) for row in range(self.rows) for col in range(self.cols) if curr[row][col]]
+            births = sum(1 for row, col in cells if not prev[row][col])
+            deaths = sum(prev[row][col] and not curr[row][col]
+                         for row in range(self.rows) for col in range(self.cols))
+            box = None
+            if cells:
+                rows, cols = zip(*cells)
+                box = (min(rows), min(cols), max(rows), max(cols))
+            self._stats = Stats(births, deaths, len(cells), box)
+            self.changes, self._counted = births + deaths, curr
+        return self._stats
+
     @property
     def is_max_generations_exceeded(self) -> bool:
         """
@@ -102,35 +148,29 @@ class GameOfLife:
         """
         Изменилось ли состояние клеток с предыдущего шага.
         """
+        if self.changes is not None and self._counted is self.curr_generation:
+            return self.changes > 0
         return self.prev_generation != self.curr_generation
 
-    @staticmethod
-    def from_file(filename) -> 'GameOfLife':
+    @classmethod
+    def from_file(cls, filename) -> 'GameOfLife':
         """
-        Прочитать состояние клеток из указанного файла.
+        Прочитать состояние клеток из указанного файла (формат - по
+        расширению, см. `formats.load`).
         """
-        grid_file = open(filename)
-
-        grid = grid_file.readlines()
-        for i in range(len(grid)):
-            grid[i] = list(map(int, list(grid[i][0:len(grid[i])-1])))
-        life = GameOfLife((len(grid), len(grid[i])))
-        life.curr_generation = grid
-
-        grid_file.close()
-
+        # Форматы файлов требуют NumPy, а для игры он не нужен
+        import formats
+        grid = formats.load(filename)
+        life = cls(grid.shape, randomize=False)
+        life.curr_generation = grid.tolist()
         return life
 
     def save(self, filename) -> None:
         """
         Сохранить текущее состояние клеток в указанный файл.
         """
-        file = open(filename, 'w')
-        for row in range(len(self.curr_generation)):
-            file.write("".join(map(str, self.curr_generation[row])) + '\n')
-
-        file.close()
-
+        import formats
+        formats.save(filename, self.curr_generation)
 
 
 class UI(abc.ABC):
@@ -143,8 +183,10 @@ class UI(abc.ABC):
 
 
 class Console(UI):
-    def __init__(self, life: GameOfLife) -> None:
+    def __init__(self, life: GameOfLife, cycle_depth: int = 64) -> None:
         super().__init__(life)
+        # Поле, которое зациклилось, дальше не обновляется
+        self.cycles = CycleDetector(cycle_depth)
 
     def draw_borders(self, screen) -> None:
         """ Отобразить рамку """
@@ -170,19 +212,33 @@ class Console(UI):
                 else:
                     screen.addstr(x+1, y+1, ' ')
 
+    def draw_stats(self, screen) -> None:
+        """ Строка со статистикой под полем """
+        stats = life.stats
+        line = max(life.rows, life.cols) + 2
+        screen.move(line, 0)
+        screen.clrtoeol()
+        screen.addstr(line, 0, f'Поколение {life.generations}  живых {stats.population}  '
+                               f'+{stats.births} -{stats.deaths}')
+
     def run(self) -> None:
         screen = curses.initscr()
         curses.curs_set(0)
 
         self.draw_borders(screen)
         self.draw_grid(screen)
+        self.draw_stats(screen)
 
         running = True
+        self.cycles.update(life)
 
         while running:
-            while life.is_changing and not life.is_max_generations_exceeded:
+            while (life.is_changing and not life.is_max_generations_exceeded and
+                   not self.cycles.found):
                 life.step()
+                self.cycles.update(life)
                 self.draw_grid(screen)
+                self.draw_stats(screen)
 
                 screen.refresh()
                 time.sleep(0.5)
@@ -190,6 +246,8 @@ class Console(UI):
                 running = False
 
         curses.endwin()
+        if self.cycles.found:
+            print(f'Цикл: период {self.cycles.period} с поколения {self.cycles.start}')
 
 
 if __name__ == '__main__':
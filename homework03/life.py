@@ -2,17 +2,38 @@ import pathlib
 import random
 import abc
 import curses
-from copy import deepcopy
 from pygame.locals import *
 import time
+from typing import NamedTuple
+
+
+class Stats(NamedTuple):
+    """
+    Статистика поколения: сколько клеток родилось и умерло на последнем
+    шаге, сколько живых клеток и прямоугольник (top, left, bottom, right)
+    вокруг них (None, если живых клеток нет).
+    """
+    births: int
+    deaths: int
+    population: int
+    bounding_box: tuple
+
 
 class GameOfLife:
 
-    def __init__(self, size: tuple, randomize: bool=True, max_generations: int=None) -> None:
+    def __init__(self, size: tuple, randomize: bool=True, max_generations: int=None,
+                 double_buffer: bool=False) -> None:
         # Размер клеточного поля
         self.rows, self.cols = size
+        # Считать новое поколение на месте предыдущего, а не в новом списке
+        self.double_buffer = double_buffer
+        # Сколько клеток изменилось на последнем шаге (None - неизвестно)
+        # и поколение, для которого это посчитано
+        self.changes = None
+        self._counted = None
+        self._stats = None
         # Предыдущее поколение клеток
-        self.prev_generation = self.create_grid()
+        self.prev_generation = self.create_grid(randomize=False)
         # Текущее поколение клеток
         self.curr_generation = self.create_grid(randomize=randomize)
         # Максимальное число поколений
@@ -38,10 +59,10 @@ class GameOfLife:
         out : Grid
             Матрица клеток размером `cell_height` х `cell_width`.
         """
-        grid = [[0] * self.rows for i in range(self.cols)]
+        grid = [[0] * self.cols for i in range(self.rows)]
         if randomize:
-            for i in range(self.cols):
-                for j in range(self.rows):
+            for i in range(self.rows):
+                for j in range(self.cols):
                     grid[i][j] = random.randint(0, 1)
         return grid
 
@@ -77,19 +98,48 @@ class GameOfLife:
         """
         Получить следующее поколение клеток.
 
+        В режиме double_buffer новое поколение записывается в список
+        предыдущего поколения, который после шага больше не нужен, так что
+        в памяти всегда ровно два поля. Заодно считается число изменившихся
+        клеток, по которому `is_changing` отвечает без сравнения полей.
+
         Returns
         ----------
         out : Grid
             Новое поколение клеток.
         """
-        a = deepcopy(self.curr_generation)
+        grid = self.curr_generation
+        if self.double_buffer and self.prev_generation is not grid:
+            new = self.prev_generation
+        else:
+            new = [[0] * self.cols for _ in range(self.rows)]
+        births = deaths = population = 0
+        top = bottom = None
+        left, right = self.cols, -1
         for i in range(self.rows):
+            row, new_row = grid[i], new[i]
+            first = last = None
             for j in range(self.cols):
-                if sum(self.get_neighbours((i,j))) < 2 or sum(self.get_neighbours((i,j))) > 3:
-                    a[i][j] = 0
-                elif sum(self.get_neighbours((i,j))) == 3:
-                    a[i][j] = 1
-        self.curr_generation = a
+                count = sum(self.get_neighbours((i, j)))
+                value = 1 if count == 3 or (count == 2 and row[j]) else 0
+                new_row[j] = value
+                if value:
+                    population += 1
+                    if first is None:
+                        first = j
+                    last = j
+                    if not row[j]:
+                        births += 1
+                elif row[j]:
+                    deaths += 1
+            if first is not None:
+                top = i if top is None else top
+                bottom = i
+                left, right = min(left, first), max(right, last)
+        self.prev_generation, self.curr_generation = grid, new
+        self.changes, self._counted = births + deaths, new
+        self._stats = Stats(births, deaths, population,
+                            None if top is None else (top, left, bottom, right))
         return self.curr_generation
 
 
@@ -97,55 +147,96 @@ class GameOfLife:
         """
         Выполнить один шаг игры.
         """
-        self.prev_generation = deepcopy(self.curr_generation)
-        self.curr_generation = deepcopy(self.get_next_generation())
+        self.get_next_generation()
         self.generations += 1
 
+    def toggle(self, cell: tuple) -> None:
+        """
+        Изменить состояние клетки `cell` на противоположное.
+        """
+        row, col = cell
+        self.curr_generation[row][col] = 1 - self.curr_generation[row][col]
+        self.changes = None
+        self._stats = None
+
     @property
-    def is_max_generations_exceeded(self) -> bool:
+    def stats(self) -> Stats:
         """
-        Не превысило ли текущее число поколений максимально допустимое.
+        Статистика текущего поколения. Обычно она уже посчитана при вычислении
+        поколения; если поле изменили снаружи, она пересчитывается один раз.
+        """
+        if self._stats is None or self._counted is not self.curr_generation:
+            self._stats = self.count_stats()
+            self.changes = self._stats.births + self._stats.deaths
+            self._counted = self.curr_generation
+        return self._stats
+
+    def count_stats(self) -> Stats:
         """
-        count = 0
+        Посчитать статистику полным просмотром предыдущего и текущего поколений.
+        """
+        births = deaths = population = 0
+        rows, cols = [], []
         for i in range(self.rows):
             for j in range(self.cols):
-                if self.curr_generation[i][j] == 1:
-                    count += 1
-        if count > self.max_generations:
-            return True
-        else:
+                prev, curr = self.prev_generation[i][j], self.curr_generation[i][j]
+                if curr:
+                    population += 1
+                    rows.append(i)
+                    cols.append(j)
+                if curr and not prev:
+                    births += 1
+                elif prev and not curr:
+                    deaths += 1
+        box = (min(rows), min(cols), max(rows), max(cols)) if rows else None
+        return Stats(births, deaths, population, box)
+
+    @property
+    def is_max_generations_exceeded(self) -> bool:
+        """
+        Не превысило ли текущее число поколений максимально допустимое.
+        """
+        if self.max_generations is None:
             return False
+        return self.generations >= self.max_generations
 
     @property
     def is_changing(self) -> bool:
         """
         Изменилось ли состояние клеток с предыдущего шага.
         """
-        if self.prev_generation != self.curr_generation:
-            return True
-        return False
+        if self.changes is not None and self._counted is self.curr_generation:
+            return self.changes > 0
+        return self.prev_generation != self.curr_generation
 
 
-    @staticmethod
-    def from_file(filename) -> 'GameOfLife':
+    def to_array(self) -> 'numpy.ndarray':
         """
-        Прочитать состояние клеток из указанного файла.
+        Текущее поколение в виде матрицы uint8 размером rows x cols.
         """
-        file = open(filename)
-        grid = file.readlines()
-        for i in range(len(grid)):
-            grid[i] = list(map(int, grid[i][0:len(grid[i]) - 2]))
-        self.curr_generation = grid
-        life = GameOfLife((len(grid[0]),len(grid)))
-        file.close()
-        return life
+        # NumPy и форматы файлов нужны только здесь и при работе с файлами:
+        # списочная реализация обходится без них
+        import numpy as np
+        return np.asarray(self.curr_generation, dtype=np.uint8)
 
+    @classmethod
+    def from_file(cls, filename) -> 'GameOfLife':
+        """
+        Прочитать состояние клеток из указанного файла. Формат определяется
+        по расширению (см. `formats.load`): .rle, .cells, упакованный .bin
+        или строки из 0 и 1, как в grid.txt.
+        """
+        import formats
+        grid = formats.load(filename)
+        life = cls(grid.shape, randomize=False)
+        # Списочная реализация хранит поле в списках, остальные принимают матрицу
+        life.curr_generation = grid.tolist() if isinstance(life.curr_generation, list) else grid
+        return life
 
     def save(self, filename) -> None:
         """
-        Сохранить текущее состояние клеток в указанный файл.
+        Сохранить текущее состояние клеток в указанный файл в формате,
+        определяемом по расширению (см. `from_file`).
         """
-        file = open(filename, 'w')
-        for i in range(len(self.curr_generation)):
-            file.write(str(self.curr_generation[i]) + "/n")
-        file.close()
+        import formats
+        formats.save(filename, self.to_array())
@@ -0,0 +1,164 @@
+import numpy as np
+
+import formats
+from formats import WORD, pack, unpack
+from life import GameOfLife, Stats
+
+ONE = np.uint64(1)
+LAST = np.uint64(WORD - 1)
+
+
+def tail_mask(cols: int) -> np.uint64:
+    """ Маска клеток поля в последнем слове строки """
+    tail = cols % WORD
+    return np.uint64((1 << tail) - 1 if tail else (1 << WORD) - 1)
+
+
+def _add(s0: np.ndarray, s1: np.ndarray, s2: np.ndarray, x: np.ndarray) -> None:
+    """
+    Прибавить по биту x к счетчикам (s2, s1, s0) во всех позициях сразу.
+    s2 - признак "уже не меньше четырех": дальше считать не нужно,
+    такая клетка все равно будет мертвой.
+    """
+    carry = s0 & x
+    s0 ^= x
+    s2 |= s1 & carry
+    s1 ^= carry
+
+
+def next_generation(packed: np.ndarray, cols: int) -> np.ndarray:
+    """
+    Следующее поколение упакованного поля.
+
+    Для каждого слова восемь соседних битов складываются побитовым сумматором,
+    так что одна операция NumPy обрабатывает 64 клетки. Соседи слева и справа
+    получаются сдвигом слов с переносом бита из соседнего слова, соседи сверху
+    и снизу - сдвигом срезов строк без копирования.
+    """
+    west = packed << ONE
+    west[:, 1:] |= packed[:, :-1] >> LAST
+    east = packed >> ONE
+    east[:, :-1] |= packed[:, 1:] << LAST
+
+    s0 = np.zeros_like(packed)
+    s1 = np.zeros_like(packed)
+    s2 = np.zeros_like(packed)
+    for x in (west, east):
+        _add(s0, s1, s2, x)
+    for x in (west, packed, east):
+        # Сосед сверху для строки r - строка r - 1, снизу - строка r + 1
+        _add(s0[1:], s1[1:], s2[1:], x[:-1])
+        _add(s0[:-1], s1[:-1], s2[:-1], x[1:])
+
+    # Живая клетка - ровно три соседа или два соседа и сама клетка жива
+    s0 |= packed
+    s0 &= s1
+    s0 &= ~s2
+    s0[:, -1] &= tail_mask(cols)
+    return s0
+
+
+class BitGameOfLife(GameOfLife):
+    """
+    Игра "Жизнь" на упакованном поле: бит на клетку, так что поле
+    10000 x 10000 занимает 12.5 Мб. `curr_generation` и `prev_generation` -
+    упакованные матрицы uint64 размером rows x ceil(cols / 64); списки
+    клеток при присваивании упаковываются, `unpack` возвращает обычную матрицу.
+    """
+
+    @property
+    def curr_generation(self) -> np.ndarray:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid) -> None:
+        self._curr_generation = self._packed(grid)
+
+    @property
+    def prev_generation(self) -> np.ndarray:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid) -> None:
+        self._prev_generation = self._packed(grid)
+
+    def _packed(self, grid) -> np.ndarray:
+        if isinstance(grid, np.ndarray) and grid.dtype == np.uint64:
+            return grid
+        return pack(grid, self.cols)
+
+    def create_grid(self, randomize: bool = True) -> np.ndarray:
+        words = -(-self.cols // WORD)
+        if not randomize:
+            return np.zeros((self.rows, words), dtype=np.uint64)
+        grid = np.random.randint(0, 1 << WORD, (self.rows, words), dtype=np.uint64)
+        grid[:, -1] &= tail_mask(self.cols)
+        return grid
+
+    def get_cell(self, cell: tuple) -> int:
+        row, col = cell
+        return int(self.curr_generation[row, col // WORD] >> np.uint64(col % WORD) & ONE)
+
+    def toggle(self, cell: tuple) -> None:
+        row, col = cell
+        self.curr_generation[row, col // WORD] ^= ONE << np.uint64(col % WORD)
+        self.changes = None
+        self._stats = None
+
+    def get_neighbours(self, cell: tuple) -> list:
+        x, y = cell
+        return [self.get_cell((i, j))
+                for i in range(x - 1, x + 2) for j in range(y - 1, y + 2)
+                if 0 <= i < self.rows and 0 <= j < self.cols and (i, j) != cell]
+
+    def get_next_generation(self) -> np.ndarray:
+        self.curr_generation = next_generation(self.curr_generation, self.cols)
+        return self.curr_generation
+
+    def step(self) -> None:
+        self.prev_generation = self.curr_generation
+        self.curr_generation = next_generation(self.curr_generation, self.cols)
+        self.generations += 1
+
+    @property
+    def is_changing(self) -> bool:
+        return not np.array_equal(self.prev_generation, self.curr_generation)
+
+    def count_stats(self) -> Stats:
+        """ Клетки считаются по словам: np.bitwise_count дает число единиц в каждом """
+        curr, prev = self.curr_generation, self.prev_generation
+        rows = np.flatnonzero(curr.any(axis=1))
+        box = None
+        if rows.size:
+            columns = np.bitwise_or.reduce(curr, axis=0)
+            cols = np.flatnonzero(unpack(columns[np.newaxis], self.cols)[0])
+            box = (int(rows[0]), int(cols[0]), int(rows[-1]), int(cols[-1]))
+        return Stats(int(np.bitwise_count(curr & ~prev).sum()), int(np.bitwise_count(prev & ~curr).sum()),
+                     int(np.bitwise_count(curr).sum()), box)
+
+    def unpack(self) -> np.ndarray:
+        """ Текущее поколение в виде матрицы uint8 """
+        return unpack(self.curr_generation, self.cols)
+
+    def to_array(self) -> np.ndarray:
+        return self.unpack()
+
+    @classmethod
+    def from_file(cls, filename) -> 'BitGameOfLife':
+        """
+        Упакованный файл .bin отображается в память как есть, без распаковки:
+        страницы читаются с диска при первом обращении, а изменения поля
+        (copy-on-write) в файл не попадают.
+        """
+        if not filename.lower().endswith('.bin'):
+            return super().from_file(filename)
+        packed, cols = formats.load_packed(filename, mode='c')
+        life = cls((packed.shape[0], cols), randomize=False)
+        life.curr_generation = packed
+        return life
+
+    def save(self, filename) -> None:
+        """ В формат .bin поле пишется одной записью прямо из упакованных слов """
+        if not filename.lower().endswith('.bin'):
+            return super().save(filename)
+        formats.save_packed(filename, self.curr_generation, self.cols)
@@ -0,0 +1,101 @@
+import numpy as np
+
+from life import GameOfLife, Stats
+
+# Смещения восьми соседей клетки
+OFFSETS = [(dr, dc) for dr in (0, 1, 2) for dc in (0, 1, 2) if (dr, dc) != (1, 1)]
+
+
+def neighbour_counts(grid: np.ndarray) -> np.ndarray:
+    """
+    Число живых соседей для всех клеток сразу.
+
+    Поле окружается рамкой из мертвых клеток, после чего складываются восемь
+    сдвинутых копий поля, поэтому клетки на краях обрабатываются так же, как
+    в `GameOfLife.get_neighbours`.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Матрица клеток типа uint8.
+
+    Returns
+    ----------
+    out : np.ndarray
+        Матрица того же размера с числом живых соседей.
+    """
+    rows, cols = grid.shape
+    padded = np.pad(grid, 1)
+    counts = np.zeros_like(grid)
+    for dr, dc in OFFSETS:
+        counts += padded[dr:dr + rows, dc:dc + cols]
+    return counts
+
+
+def next_generation(grid: np.ndarray) -> np.ndarray:
+    """
+    Следующее поколение: клетка жива, если у нее три живых соседа или если
+    она жива и у нее два живых соседа.
+    """
+    counts = neighbour_counts(grid)
+    return ((counts == 3) | ((counts == 2) & (grid == 1))).view(np.uint8)
+
+
+def grid_stats(prev: np.ndarray, curr: np.ndarray) -> Stats:
+    """ Статистика поколения (см. `life.Stats`) для матриц клеток """
+    alive, was = curr.astype(bool), prev.astype(bool)
+    rows = np.flatnonzero(alive.any(axis=1))
+    cols = np.flatnonzero(alive.any(axis=0))
+    box = (int(rows[0]), int(cols[0]), int(rows[-1]), int(cols[-1])) if rows.size else None
+    return Stats(int(np.count_nonzero(alive & ~was)), int(np.count_nonzero(was & ~alive)),
+                 int(np.count_nonzero(alive)), box)
+
+
+class NumpyGameOfLife(GameOfLife):
+    """
+    Игра "Жизнь" с полем в массиве NumPy. Публичный интерфейс тот же, что у
+    `GameOfLife`: `curr_generation` и `prev_generation` - матрицы uint8,
+    которые индексируются как `grid[row][col]`; присвоенные списки списков
+    преобразуются в массивы.
+    """
+
+    @property
+    def curr_generation(self) -> np.ndarray:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid) -> None:
+        self._curr_generation = np.asarray(grid, dtype=np.uint8)
+
+    @property
+    def prev_generation(self) -> np.ndarray:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid) -> None:
+        self._prev_generation = np.asarray(grid, dtype=np.uint8)
+
+    def create_grid(self, randomize: bool = True) -> np.ndarray:
+        if randomize:
+            return np.random.randint(0, 2, (self.rows, self.cols), dtype=np.uint8)
+        return np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+    def get_next_generation(self) -> np.ndarray:
+        self.curr_generation = next_generation(self.curr_generation)
+        return self.curr_generation
+
+    def step(self) -> None:
+        """
+        Выполнить один шаг игры. Новое поколение всегда создается в новом
+        массиве, поэтому старое можно не копировать.
+        """
+        self.prev_generation = self.curr_generation
+        self.curr_generation = next_generation(self.curr_generation)
+        self.generations += 1
+
+    @property
+    def is_changing(self) -> bool:
+        return not np.array_equal(self.prev_generation, self.curr_generation)
+
+    def count_stats(self) -> Stats:
+        return grid_stats(self.prev_generation, self.curr_generation)
@@ -6,7 +6,8 @@ from copy import deepcopy
 
 class GameOfLife:
 
-    def __init__(self, width: int = 640, height: int = 480, cell_size: int = 10, speed: int = 10) -> None:
+    def __init__(self, width: int = 640, height: int = 480, cell_size: int = 10, speed: int = 10,
+                 steps_per_frame: int = 1, turbo_steps: int = 100) -> None:
         self.width = width
         self.height = height
         self.cell_size = cell_size
@@ -23,6 +24,12 @@ class GameOfLife:
         # Скорость протекания игры
         self.speed = speed
 
+        # Поколений на кадр; клавиша T включает турбо-режим, в котором кадр
+        # рисуется раз в turbo_steps поколений без ограничения частоты кадров
+        self.steps_per_frame = steps_per_frame
+        self.turbo_steps = turbo_steps
+        self.turbo = False
+
     def draw_lines(self) -> None:
         # @see: http://www.pygame.org/docs/ref/draw.html#pygame.draw.line
         for x in range(0, self.width, self.cell_size):
@@ -38,16 +45,23 @@ class GameOfLife:
         self.grid = self.create_grid()
         pygame.display.set_caption('Game of Life')
         self.screen.fill(pygame.Color('white'))
+        self.draw_lines()
+        self.draw_grid(self.grid)
+        pygame.display.flip()
         running = True
         while running:
             for event in pygame.event.get():
                 if event.type == QUIT:
                     running = False
-            self.draw_lines()
-            self.draw_grid()
-            self.get_next_generation()
-            pygame.display.flip()
-            clock.tick(self.speed)
+                elif event.type == KEYDOWN and event.key == pygame.K_t:
+                    self.turbo = not self.turbo
+            prev = self.grid
+            for _ in range(self.turbo_steps if self.turbo else self.steps_per_frame):
+                self.get_next_generation()
+            # Обновляются только изменившиеся клетки, сетка не перерисовывается
+            pygame.display.update(self.draw_grid(self.grid, prev))
+            clock.tick(0 if self.turbo else self.speed)
+            pygame.display.set_caption(f'Game of Life, FPS: {clock.get_fps():.0f}')
         pygame.quit()
 
     def create_grid(self, randomize: bool = True) -> list:
@@ -76,17 +90,24 @@ class GameOfLife:
         return grid
 
 
-    def draw_grid(self,grid) -> None:
+    def draw_grid(self, grid, prev=None) -> list:
         """
         Отрисовка списка клеток с закрашиванием их в соответствующе цвета.
+
+        Если передано предыдущее поколение prev, рисуются только клетки,
+        которые изменились. Возвращает прямоугольники нарисованных клеток
+        для `pygame.display.update`.
         """
+        colors = [pygame.Color('white'), pygame.Color('green')]
+        rects = []
         for i in range(self.cell_height):
-            for j in range(self.cell_height):
-                if grid[i][j] == 1:
-                    c = pygame.Color('green')
-                else:
-                    c = pygame.Color('white')
-                pygame.draw.rect(self.screen, c, (j * self.cell_width + 1, i * self.cell_height + 1, self.cell_size - 1, self.cell_size - 1))
+            for j in range(self.cell_width):
+                if prev is None or prev[i][j] != grid[i][j]:
+                    rect = pygame.Rect(j * self.cell_size + 1, i * self.cell_size + 1,
+                                       self.cell_size - 1, self.cell_size - 1)
+                    pygame.draw.rect(self.screen, colors[grid[i][j]], rect)
+                    rects.append(rect)
+        return rects
 
 
     def get_neighbours(self, cell: tuple) -> list:
@@ -0,0 +1,189 @@
+import numpy as np
+
+from life import GameOfLife, Stats
+
+# Клетка и восемь ее соседей
+AREA = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)]
+OFFSETS = [offset for offset in AREA if offset != (0, 0)]
+
+
+def next_generation(live: set, changed: set, size: tuple = None) -> tuple:
+    """
+    Следующее поколение разреженного поля.
+
+    Клетка может изменить состояние, только если изменилась она сама или
+    кто-то из ее соседей, поэтому пересчитываются лишь клетки рядом с
+    изменениями прошлого шага.
+
+    Parameters
+    ----------
+    live : set
+        Координаты (row, col) живых клеток.
+    changed : set
+        Клетки, изменившиеся на прошлом шаге (для первого шага - все живые).
+    size : tuple
+        Размер (rows, cols) ограниченного поля или None для бесконечного.
+
+    Returns
+    ----------
+    out : tuple
+        Новое множество живых клеток, родившиеся и умершие клетки.
+    """
+    candidates = {(row + dr, col + dc) for row, col in changed for dr, dc in AREA}
+    if size is not None:
+        rows, cols = size
+        candidates = {(row, col) for row, col in candidates if 0 <= row < rows and 0 <= col < cols}
+    born, died = set(), set()
+    for row, col in candidates:
+        count = 0
+        for dr, dc in OFFSETS:
+            if (row + dr, col + dc) in live:
+                count += 1
+        if (row, col) in live:
+            if count < 2 or count > 3:
+                died.add((row, col))
+        elif count == 3:
+            born.add((row, col))
+    return (live - died) | born, born, died
+
+
+def set_stats(prev: set, curr: set) -> Stats:
+    """ Статистика поколения (см. `life.Stats`) для множеств живых клеток """
+    box = None
+    if curr:
+        rows = [row for row, _ in curr]
+        cols = [col for _, col in curr]
+        box = min(rows), min(cols), max(rows), max(cols)
+    return Stats(len(curr - prev), len(prev - curr), len(curr), box)
+
+
+def cells_to_array(cells: set, box: tuple = None) -> np.ndarray:
+    """
+    Матрица uint8 клеток внутри прямоугольника box = (top, left, bottom,
+    right) включительно; по умолчанию - вокруг живых клеток.
+    """
+    box = box or set_stats(set(), cells).bounding_box
+    if box is None:
+        return np.zeros((0, 0), dtype=np.uint8)
+    top, left, bottom, right = box
+    grid = np.zeros((bottom - top + 1, right - left + 1), dtype=np.uint8)
+    for row, col in cells:
+        if top <= row <= bottom and left <= col <= right:
+            grid[row - top, col - left] = 1
+    return grid
+
+
+def parse_pattern(lines: list) -> set:
+    """
+    Живые клетки шаблона в текстовом виде: 'O', '*' или '1' - живая клетка,
+    любой другой символ - мертвая.
+    """
+    return {(row, col) for row, line in enumerate(lines)
+            for col, ch in enumerate(line) if ch in 'O*1'}
+
+
+class SparseGameOfLife(GameOfLife):
+    """
+    Игра "Жизнь", хранящая только живые клетки. `curr_generation` и
+    `prev_generation` - множества координат (row, col); присвоенная матрица
+    клеток преобразуется в множество. Если size равен None, поле
+    бесконечно, и клетки могут иметь любые, в том числе отрицательные,
+    координаты.
+    """
+
+    def __init__(self, size: tuple = None, randomize: bool = True, max_generations: int = None) -> None:
+        self.size = size
+        self.changed = set()
+        super().__init__(size or (0, 0), randomize=randomize and size is not None,
+                         max_generations=max_generations)
+
+    @property
+    def curr_generation(self) -> set:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid) -> None:
+        self._curr_generation = self._cells(grid)
+        # Новое поле целиком считается изменившимся
+        self.changed = set(self._curr_generation)
+
+    @property
+    def prev_generation(self) -> set:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid) -> None:
+        self._prev_generation = self._cells(grid)
+
+    @staticmethod
+    def _cells(grid) -> set:
+        if isinstance(grid, (set, frozenset)):
+            return set(grid)
+        return {(i, j) for i, row in enumerate(grid) for j, value in enumerate(row) if value}
+
+    def create_grid(self, randomize: bool = True) -> set:
+        if not randomize:
+            return set()
+        return {(i, j) for i, row in enumerate(super().create_grid(randomize)) for j, value in enumerate(row)
+                if value}
+
+    def add_pattern(self, pattern, top: int = 0, left: int = 0) -> None:
+        """
+        Добавить шаблон с левым верхним углом в (top, left). Шаблон - строки
+        текста (см. `parse_pattern`) или множество координат.
+        """
+        cells = pattern if isinstance(pattern, (set, frozenset)) else parse_pattern(pattern)
+        self.curr_generation = self.curr_generation | {(top + i, left + j) for i, j in cells}
+
+    def toggle(self, cell: tuple) -> None:
+        self.curr_generation = self.curr_generation ^ {cell}
+
+    def get_neighbours(self, cell: tuple) -> list:
+        row, col = cell
+        neighbours = []
+        for dr, dc in OFFSETS:
+            i, j = row + dr, col + dc
+            if self.size is None or (0 <= i < self.rows and 0 <= j < self.cols):
+                neighbours.append(int((i, j) in self.curr_generation))
+        return neighbours
+
+    def get_next_generation(self) -> set:
+        live, born, died = next_generation(self.curr_generation, self.changed, self.size)
+        self._curr_generation = live
+        self.changed = born | died
+        return live
+
+    def step(self) -> None:
+        # Новое множество строится заново, старое можно не копировать
+        self._prev_generation = self._curr_generation
+        self.get_next_generation()
+        self.generations += 1
+
+    @property
+    def is_changing(self) -> bool:
+        return self.prev_generation != self.curr_generation
+
+    @property
+    def population(self) -> int:
+        return len(self.curr_generation)
+
+    def bounding_box(self) -> tuple:
+        """ (top, left, bottom, right) живых клеток включительно или None """
+        return self.stats.bounding_box
+
+    def count_stats(self) -> Stats:
+        return set_stats(self.prev_generation, self.curr_generation)
+
+    def to_grid(self, box: tuple = None) -> list:
+        """ Матрица клеток внутри прямоугольника box (по умолчанию - вокруг живых клеток) """
+        box = box or self.bounding_box()
+        if box is None:
+            return []
+        top, left, bottom, right = box
+        return [[int((i, j) in self.curr_generation) for j in range(left, right + 1)]
+                for i in range(top, bottom + 1)]
+
+    def to_array(self) -> np.ndarray:
+        """ Ограниченное поле целиком, бесконечное - вокруг живых клеток """
+        box = (0, 0, self.rows - 1, self.cols - 1) if self.size is not None else None
+        return cells_to_array(self.curr_generation, box)
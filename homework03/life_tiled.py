@@ -0,0 +1,246 @@
+import multiprocessing as mp
+import os
+import weakref
+from multiprocessing import connection, shared_memory
+
+import numpy as np
+
+from life import GameOfLife, Stats
+from life_numpy import grid_stats, next_generation
+
+# Сколько секунд ждать завершения процесса после команды остановиться
+JOIN_TIMEOUT = 5
+
+
+def split_strips(rows: int, workers: int) -> list:
+    """
+    Разбить строки поля на workers полос почти одинаковой высоты.
+
+    >>> split_strips(10, 3)
+    [(0, 3), (3, 6), (6, 10)]
+    """
+    bounds = [rows * i // workers for i in range(workers + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _attach(names: tuple, shape: tuple) -> tuple:
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    boards = [np.ndarray(shape, dtype=np.uint8, buffer=block.buf) for block in blocks]
+    return blocks, boards
+
+
+def _worker(names: tuple, shape: tuple, strip: tuple, index: int, changed, conn,
+            step_done) -> None:
+    """
+    Цикл процесса, считающего полосу строк [top, bottom). Число поколений
+    приходит по каналу conn, по нему же процесс сообщает, что закончил.
+    Перед каждым поколением процесс копирует свою полосу вместе с
+    граничными (halo) строками соседей из текущего буфера и записывает
+    результат в другой буфер; барьер step_done гарантирует, что никто не
+    читает буфер, пока в него пишут.
+    """
+    blocks, boards = _attach(names, shape)
+    top, bottom = strip
+    lo, hi = max(top - 1, 0), min(bottom + 1, shape[0])
+    parity = 0
+    try:
+        while True:
+            try:
+                steps = conn.recv()
+            except EOFError:
+                return
+            if steps < 0:
+                return
+            for _ in range(steps):
+                src, dst = boards[parity], boards[1 - parity]
+                new = next_generation(src[lo:hi].copy())[top - lo:bottom - lo]
+                changed[index] = not np.array_equal(new, src[top:bottom])
+                dst[top:bottom] = new
+                parity ^= 1
+                step_done.wait()
+            conn.send(steps)
+    finally:
+        del boards
+        for block in blocks:
+            block.close()
+
+
+def _release(blocks: list, processes: list, conns: list) -> None:
+    """
+    Остановить процессы и освободить разделяемую память. Вызывается из
+    `close` или сборщиком мусора (weakref.finalize), в том числе при выходе
+    из интерпретатора, поэтому не обращается к самой игре.
+    """
+    for conn in conns:
+        try:
+            conn.send(-1)
+        except OSError:
+            pass
+    for process in processes:
+        process.join(JOIN_TIMEOUT)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+    for conn in conns:
+        conn.close()
+    processes.clear()
+    conns.clear()
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # На буфер еще ссылаются массивы снаружи; имя все равно удаляется
+            pass
+        block.unlink()
+    blocks.clear()
+
+
+class TiledGameOfLife(GameOfLife):
+    """
+    Игра "Жизнь", где поле разбито на горизонтальные полосы, и каждую полосу
+    считает свой процесс. Поле лежит в двух буферах разделяемой памяти:
+    процессы читают текущее поколение из одного и пишут следующее в другой,
+    поэтому `prev_generation` - просто второй буфер. Процессы запускаются
+    при первом шаге; `close` (или выход из with) их останавливает и
+    освобождает память, а если игру просто забыли, это сделает сборщик
+    мусора или выход из интерпретатора. Если какой-то процесс умер, шаг
+    завершается ошибкой RuntimeError, а не ждет его вечно: с процессами
+    игра общается через каналы и следит за их завершением, а барьер есть
+    только между самими процессами.
+
+    `curr_generation`, `prev_generation` и `to_array` отдают копии буферов:
+    после освобождения памяти вид на нее указывал бы на снятое отображение.
+    """
+
+    def __init__(self, size: tuple, randomize: bool = True, max_generations: int = None,
+                 workers: int = None) -> None:
+        self.rows, self.cols = size
+        self.workers = min(workers or os.cpu_count() or 1, self.rows)
+        self._blocks = [shared_memory.SharedMemory(create=True, size=self.rows * self.cols)
+                        for _ in range(2)]
+        self._boards = [np.ndarray(size, dtype=np.uint8, buffer=block.buf) for block in self._blocks]
+        self._parity = 0
+        self._processes = []
+        self._conns = []
+        self._finalizer = weakref.finalize(self, _release, self._blocks, self._processes, self._conns)
+        self._changed = mp.Array('b', self.workers, lock=False)
+        self._changed_by_step = True
+        super().__init__(size, randomize=randomize, max_generations=max_generations)
+
+    def _board(self, index: int) -> np.ndarray:
+        if not self._boards:
+            raise ValueError('tiled game is closed')
+        return self._boards[index]
+
+    @property
+    def curr_generation(self) -> np.ndarray:
+        return self._board(self._parity).copy()
+
+    @curr_generation.setter
+    def curr_generation(self, grid) -> None:
+        self._board(self._parity)[:] = grid
+        self._changed_by_step = False
+        self._stats = None
+
+    @property
+    def prev_generation(self) -> np.ndarray:
+        return self._board(1 - self._parity).copy()
+
+    @prev_generation.setter
+    def prev_generation(self, grid) -> None:
+        self._board(1 - self._parity)[:] = grid
+        self._changed_by_step = False
+        self._stats = None
+
+    def create_grid(self, randomize: bool = True) -> np.ndarray:
+        if randomize:
+            return np.random.randint(0, 2, (self.rows, self.cols), dtype=np.uint8)
+        return np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+    def toggle(self, cell: tuple) -> None:
+        self._board(self._parity)[cell] ^= 1
+        self._changed_by_step = False
+        self.changes = None
+        self._stats = None
+
+    def _start(self) -> None:
+        step_done = mp.Barrier(self.workers)
+        names = tuple(block.name for block in self._blocks)
+        for index, strip in enumerate(split_strips(self.rows, self.workers)):
+            conn, child = mp.Pipe()
+            process = mp.Process(target=_worker, daemon=True, args=(
+                names, (self.rows, self.cols), strip, index, self._changed, child, step_done))
+            process.start()
+            child.close()
+            self._processes.append(process)
+            self._conns.append(conn)
+
+    def _fail(self) -> None:
+        """ Какой-то процесс умер: остальные зависли бы на барьере, их ждать бессмысленно """
+        dead = next(process for process in self._processes if not process.is_alive())
+        _release([], self._processes, self._conns)
+        raise RuntimeError(f'tiled worker process {dead.pid} exited with code {dead.exitcode}')
+
+    def _advance(self, steps: int) -> None:
+        if not self._processes:
+            self._start()
+        try:
+            for conn in self._conns:
+                conn.send(steps)
+        except OSError:
+            self._fail()
+        pending = set(self._conns)
+        sentinels = [process.sentinel for process in self._processes]
+        while pending:
+            for ready in connection.wait(list(pending) + sentinels):
+                if ready not in pending:
+                    self._fail()
+                ready.recv()
+                pending.discard(ready)
+        # Процессы меняют буферы местами на каждом поколении так же
+        self._parity ^= steps & 1
+        self._changed_by_step = True
+        # Буферы те же самые, поэтому статистику нужно сбросить явно
+        self._stats = None
+
+    def run(self, steps: int) -> None:
+        """ Продвинуть поле на steps поколений за один запуск процессов """
+        if steps > 0:
+            self._advance(steps)
+            self.generations += steps
+
+    def get_next_generation(self) -> np.ndarray:
+        self._advance(1)
+        return self.curr_generation
+
+    def step(self) -> None:
+        self.run(1)
+
+    @property
+    def is_changing(self) -> bool:
+        """ Каждый процесс отмечает, изменилась ли его полоса на последнем поколении """
+        if self._changed_by_step:
+            return any(self._changed)
+        return not np.array_equal(self._board(1 - self._parity), self._board(self._parity))
+
+    @property
+    def stats(self) -> Stats:
+        # Поколения отдаются копиями, поэтому узнать поколение по объекту
+        # нельзя; зато любое изменение буферов сбрасывает `_stats`
+        if self._stats is None:
+            self._stats = self.count_stats()
+            self.changes = self._stats.births + self._stats.deaths
+        return self._stats
+
+    def count_stats(self) -> Stats:
+        return grid_stats(self._board(1 - self._parity), self._board(self._parity))
+
+    def close(self) -> None:
+        self._boards = []
+        self._finalizer()
+
+    def __enter__(self) -> 'TiledGameOfLife':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
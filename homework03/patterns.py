@@ -0,0 +1,33 @@
+""" Известные узоры в текстовом виде ('O' - живая клетка) """
+
+GLIDER = [
+    '.O.',
+    '..O',
+    'OOO',
+]
+
+R_PENTOMINO = [
+    '.OO',
+    'OO.',
+    '.O.',
+]
+
+# Мафусаил: стабилизируется через 5206 поколений
+ACORN = [
+    '.O.....',
+    '...O...',
+    'OO..OOO',
+]
+
+# Планерное ружье Госпера: период 30, каждые 30 поколений - новый планер
+GOSPER_GLIDER_GUN = [
+    '........................O...........',
+    '......................O.O...........',
+    '............OO......OO............OO',
+    '...........O...O....OO............OO',
+    'OO........O.....O...OO..............',
+    'OO........O...O.OO....O.O...........',
+    '..........O.....O.......O...........',
+    '...........O...O....................',
+    '............OO......................',
+]
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from checkpoint import Checkpointer
+from cycles import CycleDetector
+from life import GameOfLife
+
+
+class Simulation(threading.Thread):
+    """
+    Фоновый поток, который продвигает игру независимо от отрисовки.
+
+    Поток делает шаги, пока игра меняется и не превышено число поколений,
+    не чаще rate шагов в секунду (без ограничения, если rate не задан).
+    Если передан детектор циклов cycles, поток останавливается и на
+    найденном цикле. Если передан checkpoint, после каждого шага ему
+    сообщается о новом поколении (см. `Checkpointer.update`). Все обращения
+    к игре из других потоков должны идти под `lock`.
+    """
+
+    def __init__(self, life: GameOfLife, rate: float = None, cycles: CycleDetector = None,
+                 checkpoint: Checkpointer = None) -> None:
+        super().__init__(daemon=True)
+        self.life = life
+        self.rate = rate
+        self.cycles = cycles
+        self.checkpoint = checkpoint
+        self.lock = threading.Lock()
+        self.active = threading.Event()
+        self.stopped = threading.Event()
+        self.active.set()
+
+    @property
+    def is_finished(self) -> bool:
+        life = self.life
+        if self.cycles is not None and self.cycles.found:
+            return True
+        return life.is_max_generations_exceeded or not life.is_changing
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            if not self.active.wait(0.1):
+                continue
+            with self.lock:
+                if self.is_finished:
+                    self.active.clear()
+                    continue
+                self.life.step()
+                if self.cycles is not None:
+                    self.cycles.update(self.life)
+                if self.checkpoint is not None:
+                    self.checkpoint.update(self.life)
+            if self.rate:
+                time.sleep(1 / self.rate)
+            else:
+                # Отдать GIL потоку отрисовки
+                time.sleep(0)
+
+    def pause(self) -> None:
+        self.active.clear()
+
+    def resume(self) -> None:
+        self.active.set()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
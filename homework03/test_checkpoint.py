@@ -0,0 +1,191 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import engines
+from checkpoint import Checkpointer, capture, read_checkpoint, resume, write_checkpoint
+from life import GameOfLife
+from life_numpy import NumpyGameOfLife
+from simulation import Simulation
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, 'life.ckpt')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_resume(self):
+        for name in ('list', 'numpy', 'bits', 'sparse', 'tiled'):
+            with self.subTest(engine=name):
+                game = engines.create(name, (6, 8), randomize=False)
+                game.curr_generation = self.grid
+                for _ in range(3):
+                    game.step()
+                write_checkpoint(self.filename, capture(game))
+                resumed = resume(self.filename)
+                self.assertIs(type(game), type(resumed))
+                self.assertEqual(game.generations, resumed.generations)
+                self.assertTrue(np.array_equal(game.to_array(), resumed.to_array()))
+                self.assertEqual(game.stats, resumed.stats)
+                # Продолженная игра идет так же, как исходная
+                game.step()
+                resumed.step()
+                self.assertTrue(np.array_equal(game.to_array(), resumed.to_array()))
+                self.assertEqual(game.is_changing, resumed.is_changing)
+                for life in (game, resumed):
+                    if hasattr(life, 'close'):
+                        life.close()
+
+    def test_unbounded(self):
+        glider = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+        for name in ('sparse', 'hashlife'):
+            with self.subTest(engine=name):
+                game = engines.create(name, None, randomize=False)
+                # Узор сдвинут в отрицательные координаты
+                game.curr_generation = {(row - 20, col - 30) for row, col in glider}
+                checkpointer = Checkpointer(self.filename, every=1)
+                checkpointer.start()
+                for _ in range(8):
+                    game.step()
+                    checkpointer.update(game)
+                checkpointer.stop()
+                self.assertGreater(checkpointer.written, 0)
+                resumed = resume(self.filename)
+                self.assertIs(type(game), type(resumed))
+                self.assertEqual(game.generations, resumed.generations)
+                self.assertEqual(game.curr_generation, resumed.curr_generation)
+                self.assertEqual(game.prev_generation, resumed.prev_generation)
+                game.step()
+                resumed.step()
+                self.assertEqual(game.curr_generation, resumed.curr_generation)
+
+    def test_unbounded_to_board(self):
+        game = engines.create('sparse', None, randomize=False)
+        game.curr_generation = {(5, 6), (5, 7), (5, 8)}
+        write_checkpoint(self.filename, capture(game))
+        resumed = resume(self.filename, engine='numpy')
+        self.assertEqual((6, 9), (resumed.rows, resumed.cols))
+        self.assertEqual(3, resumed.stats.population)
+        game.toggle((-1, 0))
+        write_checkpoint(self.filename, capture(game))
+        with self.assertRaises(ValueError):
+            resume(self.filename, engine='numpy')
+
+    def test_error_is_raised(self):
+        game = NumpyGameOfLife((6, 8), randomize=False)
+        checkpointer = Checkpointer(os.path.join(self.filename, 'missing', 'life.ckpt'), every=1)
+        checkpointer.start()
+        checkpointer.save(game)
+        with self.assertRaises(OSError):
+            checkpointer.flush()
+        checkpointer.save(game)
+        # Ошибка фоновой записи поднимается и при следующем снимке
+        deadline = time.time() + 5
+        while checkpointer.error is None and time.time() < deadline:
+            time.sleep(0.01)
+        with self.assertRaises(OSError):
+            checkpointer.save(game)
+        checkpointer.stop()
+
+    def test_writer_survives_any_error(self):
+        game = NumpyGameOfLife((6, 8), randomize=False)
+        checkpointer = Checkpointer(self.filename)
+        checkpointer.start()
+        with mock.patch('checkpoint.write_checkpoint', side_effect=MemoryError):
+            checkpointer.save(game)
+            with self.assertRaises(MemoryError):
+                checkpointer.flush()
+        self.assertTrue(checkpointer.is_alive())
+        checkpointer.save(game)
+        checkpointer.stop()
+        self.assertEqual(1, checkpointer.written)
+
+    def test_area_limit(self):
+        game = engines.create('hashlife', None, randomize=False)
+        game.curr_generation = {(0, 0), (1 << 16, 1 << 16)}
+        with self.assertRaises(ValueError):
+            capture(game)
+
+    def test_resume_engine(self):
+        game = GameOfLife((6, 8), randomize=False)
+        game.curr_generation = self.grid
+        game.step()
+        write_checkpoint(self.filename, capture(game))
+        resumed = resume(self.filename, engine='numpy', max_generations=10)
+        self.assertIsInstance(resumed, NumpyGameOfLife)
+        self.assertEqual(10, resumed.max_generations)
+        self.assertEqual(game.prev_generation, resumed.prev_generation.tolist())
+        self.assertEqual(game.curr_generation, resumed.curr_generation.tolist())
+
+    def test_snapshot_is_a_copy(self):
+        game = NumpyGameOfLife((6, 8), randomize=False)
+        game.curr_generation = self.grid
+        snapshot = capture(game)
+        game.toggle((0, 0))
+        write_checkpoint(self.filename, snapshot)
+        self.assertEqual(self.grid, resume(self.filename).curr_generation.tolist())
+
+    def test_bad_magic(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            read_checkpoint(self.filename)
+
+    def test_every(self):
+        game = NumpyGameOfLife((50, 50))
+        checkpointer = Checkpointer(self.filename, every=5)
+        checkpointer.start()
+        saved = []
+        for _ in range(12):
+            game.step()
+            if checkpointer.update(game):
+                saved.append(game.generations)
+        checkpointer.stop()
+        self.assertEqual([7, 12], saved)
+        self.assertIsNone(checkpointer.error)
+        self.assertEqual(12, resume(self.filename).generations)
+
+    def test_interval(self):
+        game = NumpyGameOfLife((50, 50))
+        checkpointer = Checkpointer(self.filename, interval=0.05)
+        checkpointer.start()
+        self.assertFalse(checkpointer.update(game))
+        time.sleep(0.06)
+        game.step()
+        self.assertTrue(checkpointer.update(game))
+        checkpointer.flush()
+        self.assertEqual(1, checkpointer.written)
+        checkpointer.stop()
+
+    def test_simulation(self):
+        game = NumpyGameOfLife((6, 8), randomize=False)
+        game.curr_generation = self.grid
+        checkpointer = Checkpointer(self.filename, every=1)
+        checkpointer.start()
+        simulation = Simulation(game, checkpoint=checkpointer)
+        simulation.start()
+        deadline = time.time() + 5
+        while simulation.active.is_set() and time.time() < deadline:
+            time.sleep(0.01)
+        simulation.stop()
+        checkpointer.stop()
+        resumed = resume(self.filename)
+        self.assertEqual(game.generations, resumed.generations)
+        self.assertTrue(np.array_equal(game.curr_generation, resumed.curr_generation))
+        self.assertTrue(np.array_equal(game.prev_generation, resumed.prev_generation))
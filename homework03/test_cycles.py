@@ -0,0 +1,94 @@
+import unittest
+
+from cycles import CycleDetector
+from hashlife import HashLifeGameOfLife
+from life import GameOfLife
+from life_numpy import NumpyGameOfLife
+from life_sparse import SparseGameOfLife
+from patterns import GLIDER
+
+
+class TestCycleDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+
+    def run_until_cycle(self, game, detector, limit=200):
+        detector.update(game)
+        while not detector.found and game.generations < limit:
+            game.step()
+            detector.update(game)
+
+    def test_still_life_has_period_one(self):
+        game = GameOfLife((6, 8))
+        game.curr_generation = self.grid
+        detector = CycleDetector()
+        self.run_until_cycle(game, detector)
+        self.assertEqual(1, detector.period)
+        self.assertFalse(game.is_changing)
+        self.assertEqual(game.generations - 1, detector.start)
+
+    def test_blinker_has_period_two(self):
+        game = NumpyGameOfLife((5, 5), randomize=False)
+        game.curr_generation[2, 1:4] = 1
+        detector = CycleDetector()
+        self.run_until_cycle(game, detector)
+        self.assertEqual((1, 2), (detector.start, detector.period))
+
+    def test_cycle_start_after_transient(self):
+        # Планер на ограниченном поле упирается в угол и превращается в блок
+        game = SparseGameOfLife((8, 8), randomize=False)
+        game.add_pattern(GLIDER)
+        detector = CycleDetector()
+        self.run_until_cycle(game, detector)
+        self.assertEqual(1, detector.period)
+        self.assertGreater(detector.start, 10)
+
+    def test_longer_periods_than_depth_are_not_found(self):
+        game = NumpyGameOfLife((5, 5), randomize=False)
+        game.curr_generation[2, 1:4] = 1
+        detector = CycleDetector(depth=1)
+        self.run_until_cycle(game, detector, limit=20)
+        self.assertFalse(detector.found)
+        self.assertLessEqual(len(detector.seen), 1)
+
+    def test_fast_forward(self):
+        game = NumpyGameOfLife((5, 5), randomize=False)
+        game.curr_generation[2, 1:4] = 1
+        detector = CycleDetector()
+        self.run_until_cycle(game, detector)
+        game.step()
+        detector.fast_forward(game, 10 ** 9)
+        self.assertEqual(10 ** 9, game.generations)
+        # В первом поколении мигалка горизонтальна, значит, в четных - вертикальна
+        self.assertEqual([0, 1, 1, 1, 0], game.curr_generation[:, 2].tolist())
+
+    def test_fast_forward_big_steps(self):
+        # Пульсар с периодом 3, шаг HashLife - 2 поколения
+        lines = ['..OOO...OOO..', '', 'O....O.O....O', 'O....O.O....O', 'O....O.O....O',
+                 '..OOO...OOO..']
+        lines = lines + [''] + lines[::-1]
+        cells = {(row, col) for row, line in enumerate(lines) for col, ch in enumerate(line) if ch == 'O'}
+        game = HashLifeGameOfLife(step_log=1)
+        game.curr_generation = cells
+        reference = SparseGameOfLife(randomize=False)
+        reference.curr_generation = cells
+        detector = CycleDetector()
+        self.run_until_cycle(game, detector)
+        self.assertEqual(6, detector.period)
+        # Шаги по 2 поколения из первого попадают только в нечетные поколения
+        generation = 10 ** 9 + 1
+        detector.fast_forward(game, generation)
+        self.assertEqual(generation, game.generations)
+        for _ in range((generation - 1) % 3):
+            reference.step()
+        self.assertEqual(reference.curr_generation, game.curr_generation)
+        with self.assertRaises(ValueError):
+            detector.fast_forward(game, generation + 1)
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import formats
+from life import GameOfLife
+from life_bits import BitGameOfLife
+from life_numpy import NumpyGameOfLife
+from life_sparse import SparseGameOfLife
+from patterns import GOSPER_GLIDER_GUN
+
+
+class TestFormats(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.dir.name, name)
+
+    def test_from_file(self):
+        game = GameOfLife.from_file('grid.txt')
+        self.assertEqual((6, 8), (game.rows, game.cols))
+        self.assertEqual(self.grid, game.curr_generation)
+
+    def test_round_trip(self):
+        gun = formats.read_plaintext('\n'.join(GOSPER_GLIDER_GUN))
+        for ext in ('.txt', '.cells', '.rle', '.bin'):
+            with self.subTest(ext=ext):
+                formats.save(self.path('gun' + ext), gun)
+                self.assertTrue(np.array_equal(gun, formats.load(self.path('gun' + ext))))
+
+    def test_rle(self):
+        text = '#C comment\nx = 5, y = 6, rule = B3/S23\n2o$\n3$b2ob!\n'
+        grid = formats.read_rle(text)
+        self.assertEqual([[1, 1, 0, 0, 0], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0],
+                          [0, 1, 1, 0, 0], [0, 0, 0, 0, 0]], grid.tolist())
+        self.assertEqual('x = 5, y = 6, rule = B3/S23\n2o4$b2o!\n', formats.write_rle(grid))
+
+    def test_rle_line_width(self):
+        grid = np.tile(np.array([1, 0], dtype=np.uint8), (3, 100))
+        text = formats.write_rle(grid)
+        self.assertTrue(all(len(line) <= formats.RLE_LINE_WIDTH for line in text.splitlines()))
+        self.assertTrue(np.array_equal(grid, formats.read_rle(text)))
+
+    def test_save(self):
+        game = GameOfLife((6, 8), randomize=False)
+        game.curr_generation = self.grid
+        game.save(self.path('grid.txt'))
+        with open('grid.txt') as expected, open(self.path('grid.txt')) as actual:
+            self.assertEqual(expected.read(), actual.read())
+
+    def test_engines(self):
+        for cls in (GameOfLife, NumpyGameOfLife, BitGameOfLife, SparseGameOfLife):
+            for ext in ('.rle', '.bin'):
+                with self.subTest(engine=cls.__name__, ext=ext):
+                    game = cls.from_file('grid.txt')
+                    game.step()
+                    game.save(self.path('board' + ext))
+                    loaded = cls.from_file(self.path('board' + ext))
+                    self.assertTrue(np.array_equal(game.to_array(), loaded.to_array()))
+
+    def test_packed_is_mapped(self):
+        game = BitGameOfLife((100, 1000))
+        game.save(self.path('board.bin'))
+        self.assertEqual(formats.HEADER.size + 100 * 16 * 8, os.path.getsize(self.path('board.bin')))
+        loaded = BitGameOfLife.from_file(self.path('board.bin'))
+        self.assertIsInstance(loaded.curr_generation, np.memmap)
+        self.assertTrue(np.array_equal(game.curr_generation, loaded.curr_generation))
+        # Изменения поля не попадают в файл
+        loaded.toggle((0, 0))
+        self.assertTrue(np.array_equal(game.curr_generation, BitGameOfLife.from_file(self.path('board.bin')).curr_generation))
+        loaded.step()
+        self.assertEqual(2, loaded.generations)
+
+    def test_bad_magic(self):
+        with open(self.path('bad.bin'), 'wb') as f:
+            f.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            formats.load(self.path('bad.bin'))
@@ -0,0 +1,79 @@
+import unittest
+
+from hashlife import HashLifeGameOfLife
+from life_sparse import SparseGameOfLife, parse_pattern
+from patterns import ACORN, GLIDER, GOSPER_GLIDER_GUN
+
+
+class TestHashLife(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+
+    def test_single_steps_match_sparse_engine(self):
+        game = HashLifeGameOfLife()
+        game.curr_generation = self.grid
+        sparse = SparseGameOfLife()
+        sparse.curr_generation = self.grid
+        for _ in range(100):
+            game.step()
+            sparse.step()
+            self.assertEqual(sparse.curr_generation, game.curr_generation)
+            self.assertEqual(sparse.prev_generation, game.prev_generation)
+
+    def test_strides_match_sparse_engine(self):
+        game = HashLifeGameOfLife(step_log=4)
+        game.curr_generation = parse_pattern(ACORN)
+        sparse = SparseGameOfLife()
+        sparse.add_pattern(ACORN)
+        for _ in range(10):
+            game.step()
+            for _ in range(16):
+                sparse.step()
+            self.assertEqual(sparse.generations, game.generations)
+            self.assertEqual(sparse.curr_generation, game.curr_generation)
+
+    def test_glider_gun_after_million_generations(self):
+        # Ружье каждые 30 поколений выпускает планер из 5 клеток
+        populations = []
+        for generations in (2 ** 20 - 960, 2 ** 20):
+            game = HashLifeGameOfLife()
+            game.curr_generation = parse_pattern(GOSPER_GLIDER_GUN)
+            for j in range(generations.bit_length()):
+                if generations >> j & 1:
+                    game.advance(j)
+            populations.append(game.population)
+        self.assertEqual(960 // 30 * 5, populations[1] - populations[0])
+
+    def test_step_advances_generations_by_stride(self):
+        game = HashLifeGameOfLife(step_log=20)
+        game.curr_generation = parse_pattern(GOSPER_GLIDER_GUN)
+        game.step()
+        self.assertEqual(1 + 2 ** 20, game.generations)
+
+    def test_garbage_collection_keeps_results_correct(self):
+        game = HashLifeGameOfLife(step_log=2, max_nodes=200)
+        game.curr_generation = parse_pattern(GOSPER_GLIDER_GUN)
+        sparse = SparseGameOfLife()
+        sparse.add_pattern(GOSPER_GLIDER_GUN)
+        for _ in range(30):
+            game.step()
+            for _ in range(4):
+                sparse.step()
+        self.assertEqual(sparse.curr_generation, game.curr_generation)
+
+    def test_is_changing(self):
+        game = HashLifeGameOfLife()
+        game.curr_generation = parse_pattern(GLIDER)
+        game.step()
+        self.assertTrue(game.is_changing)
+        game.curr_generation = parse_pattern(['OO', 'OO'])
+        game.step()
+        self.assertFalse(game.is_changing)
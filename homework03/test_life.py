@@ -138,6 +138,67 @@ class TestGameOfLife(unittest.TestCase):
         self.assertFalse(game.is_changing)
 
 
+    def test_double_buffer_reuses_two_boards(self):
+        game = GameOfLife((self.rows, self.cols), double_buffer=True)
+        game.curr_generation = self.grid
+        game.step()
+        boards = {id(game.prev_generation), id(game.curr_generation)}
+        for _ in range(5):
+            game.step()
+            self.assertEqual(boards, {id(game.prev_generation), id(game.curr_generation)})
+
+    def test_double_buffer_matches_plain_stepping(self):
+        game = GameOfLife((self.rows, self.cols))
+        game.curr_generation = [row[:] for row in self.grid]
+        buffered = GameOfLife((self.rows, self.cols), double_buffer=True)
+        buffered.curr_generation = [row[:] for row in self.grid]
+        for _ in range(self.max_generations + 1):
+            game.step()
+            buffered.step()
+            self.assertEqual(game.curr_generation, buffered.curr_generation)
+            self.assertEqual(game.prev_generation, buffered.prev_generation)
+            self.assertEqual(game.is_changing, buffered.is_changing)
+
+    def test_changes_are_counted(self):
+        game = GameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        changed = sum(a != b for prev, curr in zip(game.prev_generation, game.curr_generation)
+                      for a, b in zip(prev, curr))
+        self.assertEqual(changed, game.changes)
+
+    def test_toggle_makes_board_changing(self):
+        game = GameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        for _ in range(self.max_generations + 1):
+            game.step()
+        self.assertFalse(game.is_changing)
+        game.toggle((0, 0))
+        self.assertTrue(game.is_changing)
+
+    def test_is_max_generations_not_exceeded(self):
+        game = GameOfLife((self.rows, self.cols), max_generations=4)
+        game.curr_generation = self.grid
+        game.step()
+        self.assertFalse(game.is_max_generations_exceeded)
+        self.assertFalse(GameOfLife((3, 3)).is_max_generations_exceeded)
+
+    def test_stats_are_tracked_during_update(self):
+        game = GameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        for _ in range(3):
+            game.step()
+            tracked = game.stats
+            self.assertEqual(game.count_stats(), tracked)
+            self.assertEqual(tracked.births + tracked.deaths, game.changes)
+        self.assertEqual(sum(map(sum, game.curr_generation)), game.stats.population)
+
+    def test_stats_after_toggle(self):
+        game = GameOfLife((self.rows, self.cols), randomize=False)
+        game.toggle((2, 3))
+        game.toggle((4, 5))
+        self.assertEqual((2, 0, 2, (2, 3, 4, 5)), game.stats)
+
 loader = unittest.TestLoader()
 suite = loader.loadTestsFromTestCase(TestGameOfLife)
 runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,98 @@
+import unittest
+import json
+
+import numpy as np
+
+from life_bits import BitGameOfLife, pack, unpack
+from life_numpy import NumpyGameOfLife
+
+
+class TestBitGameOfLife(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+        self.rows = 6
+        self.cols = 8
+        self.max_generations = 18
+
+    def test_pack_unpack(self):
+        grid = np.random.randint(0, 2, (5, 130), dtype=np.uint8)
+        packed = pack(grid, 130)
+        self.assertEqual((5, 3), packed.shape)
+        self.assertTrue(np.array_equal(grid, unpack(packed, 130)))
+
+    def test_random_grid_has_no_cells_outside_board(self):
+        game = BitGameOfLife((4, 70))
+        self.assertEqual(0, int(np.any(game.curr_generation[:, -1] >> np.uint64(6))))
+
+    def test_get_neighbours(self):
+        game = BitGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        neighbours = game.get_neighbours((2,3))
+        self.assertEqual(8, len(neighbours))
+        self.assertEqual(4, sum(neighbours))
+
+    def test_toggle(self):
+        game = BitGameOfLife((3, 100), randomize=False)
+        game.toggle((1, 70))
+        self.assertEqual(1, game.get_cell((1, 70)))
+        self.assertEqual(1, int(game.unpack().sum()))
+        game.toggle((1, 70))
+        self.assertEqual(0, game.get_cell((1, 70)))
+
+    def test_can_update(self):
+        game = BitGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+
+        with open('steps.txt') as f:
+            steps = json.load(f)
+
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step)-num_updates):
+                    game.curr_generation = game.get_next_generation()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.unpack().tolist())
+
+    def test_matches_numpy_engine_across_words(self):
+        # 150 столбцов - три слова, второе и третье связаны переносами
+        fast = NumpyGameOfLife((40, 150))
+        game = BitGameOfLife((40, 150))
+        game.curr_generation = fast.curr_generation
+        for _ in range(20):
+            fast.step()
+            game.step()
+            self.assertTrue(np.array_equal(fast.curr_generation, game.unpack()))
+
+    def test_stats_match_numpy_engine(self):
+        fast = NumpyGameOfLife((20, 150))
+        game = BitGameOfLife((20, 150))
+        game.curr_generation = fast.curr_generation
+        for _ in range(5):
+            fast.step()
+            game.step()
+            self.assertEqual(fast.stats, game.stats)
+
+    def test_stats_after_toggle(self):
+        game = BitGameOfLife((self.rows, self.cols), randomize=False)
+        self.assertEqual(0, game.stats.population)
+        game.toggle((2, 3))
+        game.toggle((4, 5))
+        self.assertEqual((2, 0, 2, (2, 3, 4, 5)), game.stats)
+
+    def test_is_not_changing(self):
+        game = BitGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        self.assertTrue(game.is_changing)
+        for _ in range(self.max_generations):
+            game.step()
+        self.assertFalse(game.is_changing)
@@ -0,0 +1,88 @@
+import unittest
+import random
+import json
+
+import numpy as np
+
+from life import GameOfLife
+from life_numpy import NumpyGameOfLife, neighbour_counts
+
+
+class TestNumpyGameOfLife(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+        self.rows = 6
+        self.cols = 8
+        self.max_generations = 18
+
+    def test_can_create_an_empty_grid(self):
+        game = NumpyGameOfLife((3, 4))
+        grid = game.create_grid(randomize=False)
+        self.assertEqual(np.uint8, grid.dtype)
+        self.assertEqual([[0,0,0,0], [0,0,0,0], [0,0,0,0]], grid.tolist())
+
+    def test_neighbour_counts_match_get_neighbours(self):
+        game = GameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        counts = neighbour_counts(np.array(self.grid, dtype=np.uint8))
+        for i in range(self.rows):
+            for j in range(self.cols):
+                self.assertEqual(sum(game.get_neighbours((i, j))), counts[i, j])
+
+    def test_can_update(self):
+        game = NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+
+        with open('steps.txt') as f:
+            steps = json.load(f)
+
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step)-num_updates):
+                    game.curr_generation = game.get_next_generation()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.curr_generation.tolist())
+
+    def test_matches_list_engine(self):
+        random.seed(1)
+        game = GameOfLife((20, 30))
+        fast = NumpyGameOfLife((20, 30))
+        fast.curr_generation = game.curr_generation
+        for _ in range(10):
+            game.step()
+            fast.step()
+            self.assertEqual(game.curr_generation, fast.curr_generation.tolist())
+            self.assertEqual(game.prev_generation, fast.prev_generation.tolist())
+
+    def test_stats_match_list_engine(self):
+        game = GameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        fast = NumpyGameOfLife((self.rows, self.cols))
+        fast.curr_generation = self.grid
+        for _ in range(5):
+            game.step()
+            fast.step()
+            self.assertEqual(game.stats, fast.stats)
+
+    def test_is_changing(self):
+        game = NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        self.assertTrue(game.is_changing)
+
+    def test_is_not_changing(self):
+        game = NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        for _ in range(self.max_generations + 1):
+            game.step()
+        self.assertFalse(game.is_changing)
+        self.assertEqual(self.max_generations + 2, game.generations)
@@ -0,0 +1,81 @@
+import unittest
+import json
+
+from life_numpy import NumpyGameOfLife
+from life_sparse import SparseGameOfLife, parse_pattern
+from patterns import GLIDER
+
+
+class TestSparseGameOfLife(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+        self.rows = 6
+        self.cols = 8
+        self.max_generations = 18
+
+    def test_get_neighbours_for_upper_left_corner(self):
+        game = SparseGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        neighbours = game.get_neighbours((0,0))
+        self.assertEqual(3, len(neighbours))
+        self.assertEqual(2, sum(neighbours))
+
+    def test_can_update(self):
+        game = SparseGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+
+        with open('steps.txt') as f:
+            steps = json.load(f)
+
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step)-num_updates):
+                    game.step()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.to_grid((0, 0, self.rows - 1, self.cols - 1)))
+
+    def test_matches_numpy_engine(self):
+        fast = NumpyGameOfLife((30, 40))
+        game = SparseGameOfLife((30, 40))
+        game.curr_generation = fast.curr_generation.tolist()
+        for _ in range(20):
+            fast.step()
+            game.step()
+            self.assertEqual(fast.curr_generation.tolist(), game.to_grid((0, 0, 29, 39)))
+
+    def test_glider_travels_on_unbounded_board(self):
+        game = SparseGameOfLife()
+        game.add_pattern(GLIDER, top=-10, left=-10)
+        for _ in range(4 * 100):
+            game.step()
+        self.assertEqual(5, game.population)
+        self.assertEqual((90, 90, 92, 92), game.bounding_box())
+        self.assertEqual(parse_pattern(GLIDER),
+                         {(row - 90, col - 90) for row, col in game.curr_generation})
+
+    def test_stats_match_numpy_engine(self):
+        fast = NumpyGameOfLife((30, 40))
+        game = SparseGameOfLife((30, 40))
+        game.curr_generation = fast.curr_generation.tolist()
+        for _ in range(5):
+            fast.step()
+            game.step()
+            self.assertEqual(fast.stats, game.stats)
+
+    def test_is_not_changing(self):
+        game = SparseGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        self.assertTrue(game.is_changing)
+        for _ in range(self.max_generations):
+            game.step()
+        self.assertFalse(game.is_changing)
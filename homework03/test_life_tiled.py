@@ -0,0 +1,95 @@
+import gc
+import os
+import signal
+import unittest
+import json
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from life_numpy import NumpyGameOfLife
+from life_tiled import TiledGameOfLife
+
+
+class TestTiledGameOfLife(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+        self.rows = 6
+        self.cols = 8
+        self.max_generations = 18
+
+    def test_can_update(self):
+        with open('steps.txt') as f:
+            steps = json.load(f)
+
+        with TiledGameOfLife((self.rows, self.cols), workers=3) as game:
+            game.curr_generation = self.grid
+            num_updates = 0
+            for step in sorted(steps.keys(), key=int):
+                with self.subTest(step=step):
+                    for _ in range(int(step)-num_updates):
+                        game.curr_generation = game.get_next_generation()
+                        num_updates += 1
+                    self.assertEqual(steps[step], game.curr_generation.tolist())
+
+    def test_matches_numpy_engine(self):
+        fast = NumpyGameOfLife((50, 30))
+        with TiledGameOfLife((50, 30), workers=4) as game:
+            game.curr_generation = fast.curr_generation
+            for steps in (1, 2, 5, 1):
+                for _ in range(steps):
+                    fast.step()
+                game.run(steps)
+                self.assertTrue(np.array_equal(fast.curr_generation, game.curr_generation))
+                self.assertTrue(np.array_equal(fast.prev_generation, game.prev_generation))
+            self.assertEqual(fast.generations, game.generations)
+
+    def test_is_not_changing(self):
+        with TiledGameOfLife((self.rows, self.cols), workers=2) as game:
+            game.curr_generation = self.grid
+            game.step()
+            self.assertTrue(game.is_changing)
+            game.run(self.max_generations)
+            self.assertFalse(game.is_changing)
+
+    def test_released_when_collected(self):
+        game = TiledGameOfLife((self.rows, self.cols), workers=2)
+        game.step()
+        names = [block.name for block in game._blocks]
+        processes = list(game._processes)
+        del game
+        gc.collect()
+        self.assertFalse(any(process.is_alive() for process in processes))
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name)
+
+    def test_dead_worker(self):
+        with TiledGameOfLife((self.rows, self.cols), workers=2) as game:
+            game.step()
+            os.kill(game._processes[0].pid, signal.SIGKILL)
+            game._processes[0].join()
+            with self.assertRaises(RuntimeError):
+                game.step()
+
+    def test_board_outlives_game(self):
+        board = TiledGameOfLife((50, 50)).to_array()
+        gc.collect()
+        self.assertEqual((50, 50), board.shape)
+        self.assertGreater(board.sum(), 0)
+        game = TiledGameOfLife.from_file('grid.txt')
+        game.step()
+        curr, prev, array = game.curr_generation, game.prev_generation, game.to_array()
+        game.close()
+        self.assertEqual(self.grid, prev.tolist())
+        self.assertTrue(np.array_equal(curr, array))
+        with self.assertRaises(ValueError):
+            game.curr_generation
@@ -0,0 +1,52 @@
+import unittest
+import time
+
+from life_numpy import NumpyGameOfLife
+from simulation import Simulation
+
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = [
+            [1,1,0,0,1,1,1,1],
+            [0,1,1,1,1,1,1,0],
+            [1,0,1,1,0,0,0,0],
+            [1,0,0,0,0,0,0,1],
+            [1,0,1,1,1,1,0,0],
+            [1,1,1,1,0,1,1,1]
+        ]
+
+    def wait_inactive(self, simulation):
+        deadline = time.time() + 5
+        while simulation.active.is_set() and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_runs_until_still_life(self):
+        game = NumpyGameOfLife((6, 8))
+        game.curr_generation = self.grid
+        simulation = Simulation(game)
+        simulation.start()
+        self.wait_inactive(simulation)
+        simulation.stop()
+        self.assertFalse(game.is_changing)
+        self.assertEqual(20, game.generations)
+
+    def test_stops_at_max_generations(self):
+        game = NumpyGameOfLife((6, 8), max_generations=5)
+        game.curr_generation = self.grid
+        simulation = Simulation(game)
+        simulation.start()
+        self.wait_inactive(simulation)
+        simulation.stop()
+        self.assertEqual(5, game.generations)
+
+    def test_pause(self):
+        game = NumpyGameOfLife((100, 100))
+        simulation = Simulation(game, rate=1000)
+        simulation.pause()
+        simulation.start()
+        time.sleep(0.05)
+        with simulation.lock:
+            self.assertEqual(1, game.generations)
+        simulation.stop()
@@ -8,6 +8,6 @@ class UI(abc.ABC):
     def __init__(self, life: GameOfLife) -> None:
         self.life = life
 
-    @abc.abstractmethod:
+    @abc.abstractmethod
     def run(self) -> None:
         pass
\ No newline at end of file